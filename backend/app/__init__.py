@@ -1,7 +1,9 @@
 import os
-from flask import Flask, send_from_directory
+from flask import Flask
+from sqlalchemy import event
 from app.config import config
 from app.extensions import db, migrate, jwt, cors, ma
+from app.compression import init_compression, send_precompressed
 
 # Path to frontend directory (one level up from backend)
 FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'frontend')
@@ -17,30 +19,44 @@ def create_app(config_name='default'):
     
     # Load config
     app.config.from_object(config[config_name])
+
+    # Fast JSON encoding (orjson when installed)
+    if app.config.get('JSON_PROVIDER') == 'fast':
+        from app.json_provider import FastJSONProvider
+        app.json = FastJSONProvider(app)
     
     # Initialize extensions WITH the app
     db.init_app(app)
+    _configure_sqlite(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    from app.services import tokens, user_cache
+    tokens.init_app(jwt)
+    user_cache.init_app(jwt)
     cors.init_app(app)
     ma.init_app(app)
+    init_compression(app)
     
     # Register blueprints (routes)
     from app.routes.auth import auth_bp
     from app.routes.questions import questions_bp
     from app.routes.papers import papers_bp
     from app.routes.subjects import subjects_bp
+    from app.routes.batch import batch_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(questions_bp, url_prefix='/api/questions')
     app.register_blueprint(papers_bp, url_prefix='/api/papers')
     app.register_blueprint(subjects_bp, url_prefix='/api/subjects')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
     
     # Auto-create tables and seed data (handles Vercel's ephemeral /tmp/)
     with app.app_context():
         from app.models.question import Question
         from app.models.user import User
         from app.models.subject import Subject
+        from app.models.table_version import TableVersion
+        from app.models.refresh_token import RefreshToken
         db.create_all()
         
         # Seed if DB is empty (cold start on Vercel)
@@ -50,20 +66,50 @@ def create_app(config_name='default'):
     # Health check route
     @app.route('/api/health')
     def health():
-        return {'status': 'ok', 'message': 'Server is running'}
+        from app.services.generation_cache import get_cache
+        from app.services.user_cache import get_user_cache
+        from app.services.pdf_cache import get_pdf_cache
+        from app.services.pdf_renderer import get_renderer
+        return {
+            'status': 'ok',
+            'message': 'Server is running',
+            'caches': {
+                'generation': get_cache().stats(),
+                'users': get_user_cache().stats(),
+                'pdf': get_pdf_cache().stats(),
+                'pdf_renders': get_renderer().stats()
+            }
+        }
     
-    # Serve frontend HTML files
+    # Serve frontend HTML files (precompressed .br/.gz siblings when present)
     @app.route('/')
     def serve_index():
-        return send_from_directory(FRONTEND_DIR, 'index.html')
+        return send_precompressed(FRONTEND_DIR, 'index.html')
     
     @app.route('/<path:filename>')
     def serve_frontend(filename):
-        return send_from_directory(FRONTEND_DIR, filename)
+        return send_precompressed(FRONTEND_DIR, filename)
     
     return app
 
 
+def _configure_sqlite(app):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection via an engine connect event."""
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas or not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
 def _seed_initial_data(db):
     """Seed subjects and a default admin user for fresh DB."""
     from app.models.subject import Subject
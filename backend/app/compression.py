@@ -0,0 +1,92 @@
+import gzip
+import mimetypes
+import os
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+
+# Content-Encoding -> file suffix of precompressed static siblings
+STATIC_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings():
+    """Encodings this process can produce, in order of preference"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def negotiate_encoding(encodings=None):
+    """Best encoding the client accepts (honours q-values), or None"""
+    return request.accept_encodings.best_match(encodings or available_encodings())
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=4):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def init_compression(app):
+    """
+    Compress JSON/text responses above COMPRESS_MIN_SIZE bytes with br or
+    gzip, whichever the client prefers. File and streamed responses are
+    left alone; static files use precompressed siblings instead (see
+    send_precompressed).
+    """
+    mimetypes_to_compress = set(app.config.get('COMPRESS_MIMETYPES', []))
+
+    @app.after_request
+    def compress_response(response):
+        if (not app.config.get('COMPRESS_ENABLED', True)
+                or response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in mimetypes_to_compress):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+
+        encoding = negotiate_encoding()
+        if encoding is None:
+            return response
+
+        response.set_data(compress(
+            data, encoding,
+            gzip_level=app.config.get('COMPRESS_LEVEL', 6),
+            brotli_quality=app.config.get('COMPRESS_BR_QUALITY', 4)
+        ))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def send_precompressed(directory, filename):
+    """
+    send_from_directory that prefers an up-to-date .br / .gz sibling
+    (written by precompress_frontend.py) when the client accepts it.
+    Siblings older than the source file are ignored.
+    """
+    source = os.path.join(directory, filename)
+    fresh = []
+    if os.path.isfile(source):
+        source_mtime = os.path.getmtime(source)
+        for encoding, suffix in STATIC_SUFFIXES.items():
+            sibling = source + suffix
+            if os.path.isfile(sibling) and os.path.getmtime(sibling) >= source_mtime:
+                fresh.append(encoding)
+
+    encoding = negotiate_encoding(fresh) if fresh else None
+    if encoding:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(directory, filename + STATIC_SUFFIXES[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(directory, filename)
+    response.vary.add('Accept-Encoding')
+    return response
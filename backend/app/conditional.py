@@ -0,0 +1,48 @@
+import hashlib
+from functools import wraps
+from flask import request, make_response, current_app
+from app.services import table_versions
+
+
+def versioned(keys):
+    """
+    Conditional GET for list endpoints backed by table_versions counters.
+
+    keys() returns the version names the response depends on. The ETag is
+    a hash of those versions and the request URL; if the client's
+    If-None-Match (or If-Modified-Since) still matches, a 304 is returned
+    without running the view. Apply below @jwt_required().
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = table_versions.get_many(keys())
+            fingerprint = request.full_path + '|' + ','.join(
+                f'{name}={version}' for name, (version, _) in sorted(versions.items())
+            )
+            etag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+            stamps = [updated_at for _, updated_at in versions.values() if updated_at]
+            last_modified = max(stamps).replace(microsecond=0) if stamps else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and
+                                    last_modified <= since.replace(tzinfo=None))
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -8,8 +9,65 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'fallback-secret-key')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'fallback-jwt-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600)))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES_DAYS', 14)))
+    JWT_REFRESH_REUSE_GRACE = int(os.getenv('JWT_REFRESH_REUSE_GRACE', 30))  # seconds
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     APP_NAME = os.getenv('APP_NAME', 'QuestionPaperGen')
+    GENERATION_CACHE_SIZE = int(os.getenv('GENERATION_CACHE_SIZE', 256))
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))  # seconds
+
+    # Rendered paper PDFs (see app/services/pdf_cache.py)
+    PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'qpgen-pdf-cache'))
+    PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_MB', 256)) * 1024 * 1024
+    # Worker processes for bulk PDF export (unset = one per CPU, 0 = render inline)
+    PDF_RENDER_PROCESSES = int(os.environ['PDF_RENDER_PROCESSES']) if os.getenv('PDF_RENDER_PROCESSES') else None
+    # Render PDFs in the background after a paper is created or edited
+    PDF_PRERENDER = os.getenv('PDF_PRERENDER', 'true').lower() == 'true'
+    PDF_PRERENDER_WORKERS = int(os.getenv('PDF_PRERENDER_WORKERS', 1))
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'fast')  # 'fast' (orjson) or 'default'
+
+    # bcrypt runs on a bounded pool (see app/services/passwords.py)
+    BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', 2))
+    BCRYPT_MAX_PENDING = int(os.getenv('BCRYPT_MAX_PENDING', 32))
+    BCRYPT_QUEUE_TIMEOUT = int(os.getenv('BCRYPT_QUEUE_TIMEOUT', 5))  # seconds
+
+    # Response compression (see app/compression.py). Brotli is used when the
+    # brotli package is installed, gzip otherwise.
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bytes
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip 1-9
+    COMPRESS_BR_QUALITY = int(os.getenv('COMPRESS_BR_QUALITY', 4))  # brotli 0-11
+    COMPRESS_MIMETYPES = [
+        'application/json', 'application/x-ndjson', 'text/html', 'text/css',
+        'text/csv', 'text/plain', 'application/javascript', 'text/javascript',
+    ]
+
+    # PRAGMAs applied to every new SQLite connection (see _configure_sqlite in
+    # app/__init__.py). Empty = SQLite defaults.
+    SQLITE_PRAGMAS = {}
+
+
+def _tuned_sqlite_pragmas():
+    """WAL + relaxed fsync profile for concurrent readers/writers, overridable per env var"""
+    return {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE_KIB', 64 * 1024)) * -1,  # negative = KiB
+        'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+    }
+
+
+def _pool_options():
+    """Connection pool sizing for multi-threaded workers (file-backed DBs only)"""
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_pre_ping': True,
+    }
 
 
 class DevelopmentConfig(Config):
@@ -18,12 +76,16 @@ class DevelopmentConfig(Config):
     _base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', f'sqlite:///{os.path.join(_base_dir, "instance", "qpgen.db")}')
     SQLALCHEMY_ECHO = True
+    SQLITE_PRAGMAS = _tuned_sqlite_pragmas()
+    SQLALCHEMY_ENGINE_OPTIONS = _pool_options()
 
 
 class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:////tmp/qpgen.db')
     SQLALCHEMY_ECHO = False
+    SQLITE_PRAGMAS = _tuned_sqlite_pragmas()
+    SQLALCHEMY_ENGINE_OPTIONS = _pool_options()
 
 
 class TestingConfig(Config):
@@ -2,3 +2,5 @@ from app.models.user import User
 from app.models.subject import Subject
 from app.models.question import Question
 from app.models.paper import Paper
+from app.models.table_version import TableVersion
+from app.models.refresh_token import RefreshToken
@@ -6,12 +6,17 @@ from datetime import datetime
 paper_questions = db.Table('paper_questions',
     db.Column('paper_id', db.Integer, db.ForeignKey('papers.id'), primary_key=True),
     db.Column('question_id', db.Integer, db.ForeignKey('questions.id'), primary_key=True),
-    db.Column('order', db.Integer, nullable=False, default=0)  # question order in paper
+    db.Column('order', db.Integer, nullable=False, default=0),  # question order in paper
+    # Reverse lookup: which papers use a question
+    db.Index('ix_paper_questions_question_id', 'question_id')
 )
 
 
 class Paper(db.Model):
     __tablename__ = 'papers'
+    __table_args__ = (
+        db.Index('ix_papers_created_by', 'created_by'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -35,8 +40,18 @@ class Paper(db.Model):
 
     # Many-to-many relationship with questions
     questions = db.relationship('Question', secondary=paper_questions,
+                                order_by=paper_questions.c.order,
                                 backref='papers', lazy=True)
 
+    # Counted in SQL as part of the paper query, so listing papers never
+    # loads their question lists
+    question_count = db.column_property(
+        db.select(db.func.count(paper_questions.c.question_id))
+        .where(paper_questions.c.paper_id == id)
+        .correlate_except(paper_questions)
+        .scalar_subquery()
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -47,7 +62,7 @@ class Paper(db.Model):
             'status': self.status,
             'subject_id': self.subject_id,
             'created_by': self.created_by,
-            'question_count': len(self.questions),
+            'question_count': self.question_count,
             'created_at': self.created_at.isoformat()
         }
 
@@ -4,6 +4,15 @@ from datetime import datetime
 
 class Question(db.Model):
     __tablename__ = 'questions'
+    __table_args__ = (
+        # Paper generation: pool load by subject is index-only
+        db.Index('ix_questions_subject_selection',
+                 'subject_id', 'blooms_level', 'difficulty', 'question_type', 'marks', 'times_used'),
+        # GET /api/questions/?subject_id=&cursor=: keyset pages in id order
+        db.Index('ix_questions_subject_id_id', 'subject_id', 'id'),
+        # GET /api/questions/ filters without a subject
+        db.Index('ix_questions_blooms_difficulty', 'blooms_level', 'difficulty'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
@@ -0,0 +1,26 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class RefreshToken(db.Model):
+    """
+    Server-side record of every refresh token handed out, keyed by its jti.
+    A token is only accepted while its row exists and is not revoked.
+    Rotation revokes the old row and points replaced_by at the new one, so
+    replaying a rotated token can be told apart from a logout.
+    """
+    __tablename__ = 'refresh_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+    replaced_by = db.Column(db.String(36), nullable=True)
+
+    @property
+    def is_active(self):
+        return self.revoked_at is None and self.expires_at > datetime.utcnow()
+
+    def __repr__(self):
+        return f'<RefreshToken {self.jti} user={self.user_id}>'
@@ -0,0 +1,18 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class TableVersion(db.Model):
+    """
+    Write counters for cache validation (ETag / Last-Modified).
+    One row per name: 'subjects', 'questions' and 'questions:<subject_id>'.
+    Bumped in the same transaction as the write, so every worker sees it.
+    """
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name}: {self.version}>'
@@ -0,0 +1,57 @@
+import base64
+import json
+from flask import request
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(last_id):
+    """Opaque cursor for the row after which the next page starts"""
+    payload = json.dumps({'id': last_id}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))['id'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def page_args():
+    """
+    Read ?limit= and ?cursor= from the request.
+    Returns (limit, after_id); limit is None when the client did not ask
+    for pagination, so older clients keep getting the full list.
+    """
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit', type=int)
+
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    after_id = decode_cursor(cursor) if cursor else None
+    return limit, after_id
+
+
+def paginate(query, id_column, limit, after_id):
+    """
+    Keyset pagination on an increasing id column:
+    WHERE id > :after ORDER BY id LIMIT :limit + 1.
+    Returns (rows, next_cursor).
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    query = query.order_by(id_column)
+
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1].id)
+    return rows, None
@@ -0,0 +1,37 @@
+from flask import request
+
+
+def parse_fields(specs):
+    """
+    Read ?fields=a,b,c for sparse fieldsets.
+    Returns the requested field names (id always first), or None when the
+    client wants full objects. Raises ValueError on unknown fields.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in specs]
+    if unknown:
+        raise ValueError(f'Unknown fields: {unknown}. Allowed: {sorted(specs)}')
+
+    if 'id' in fields:
+        fields.remove('id')
+    return ['id'] + fields
+
+
+def build_projection(specs, fields):
+    """
+    Columns to SELECT for the requested fields and a serializer for the
+    resulting rows. specs maps field name -> (columns, row -> value).
+    """
+    columns = {}
+    for name in fields:
+        for column in specs[name][0]:
+            columns.setdefault(column.key, column)
+
+    def serialize(row):
+        return {name: specs[name][1](row) for name in fields}
+
+    return list(columns.values()), serialize
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, current_user
 from app.extensions import db
 from app.models.user import User
+from app.services import passwords, tokens
+from app.services.passwords import PasswordHasherBusy
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -27,7 +29,10 @@ def register():
         email=data['email'],
         role=data.get('role', 'teacher')
     )
-    user.set_password(data['password'])
+    try:
+        passwords.set_password(user, data['password'])
+    except PasswordHasherBusy:
+        return _busy()
 
     db.session.add(user)
     db.session.commit()
@@ -47,27 +52,65 @@ def login():
 
     user = User.query.filter_by(email=data['email']).first()
 
-    if not user or not user.check_password(data['password']):
+    try:
+        valid = user is not None and passwords.check_password(user, data['password'])
+    except PasswordHasherBusy:
+        return _busy()
+
+    if not valid:
         return jsonify({'error': 'Invalid email or password'}), 401
 
-    # Create JWT token
-    access_token = create_access_token(identity=str(user.id))
+    # Short-lived access token + server-side refresh token
+    issued, _ = tokens.issue_tokens(user.id)
+    db.session.commit()
 
     return jsonify({
         'message': 'Login successful',
-        'access_token': access_token,
+        'access_token': issued['access_token'],
+        'refresh_token': issued['refresh_token'],
         'user': user.to_dict()
     }), 200
 
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """
+    Swap a refresh token for a new access + refresh pair (no bcrypt).
+    The presented refresh token is revoked; replaying it later is
+    treated as theft and signs the user out everywhere.
+    """
+    issued = tokens.rotate(get_jwt()['jti'], get_jwt_identity())
+    if issued is None:
+        # Another request rotated this token first
+        db.session.rollback()
+        return jsonify({'msg': 'Token has been revoked'}), 401
+    db.session.commit()
+    return jsonify(issued), 200
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(refresh=True)
+def logout():
+    """Revoke the presented refresh token, or all of the user's with {"all": true}"""
+    data = request.get_json(silent=True) or {}
+    if data.get('all'):
+        tokens.revoke_all(get_jwt_identity())
+    else:
+        tokens.revoke(get_jwt()['jti'])
+    db.session.commit()
+    return jsonify({'message': 'Logged out'}), 200
+
+
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def me():
     """Get current logged in user info"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    # Resolved from the user cache by the JWT user_lookup_loader
+    return jsonify({'user': current_user.to_dict()}), 200
 
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
 
-    return jsonify({'user': user.to_dict()}), 200
\ No newline at end of file
+def _busy():
+    response = jsonify({'error': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
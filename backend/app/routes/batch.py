@@ -0,0 +1,80 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from werkzeug.test import EnvironBuilder
+from app.extensions import db
+
+batch_bp = Blueprint('batch', __name__)
+
+MAX_BATCH_REQUESTS = 20
+
+
+@batch_bp.route('', methods=['POST'])
+@jwt_required()
+def run_batch():
+    """
+    Run several GET API calls in one round trip.
+
+    Body: {"requests": [{"id": "subjects", "path": "/api/subjects/"}, ...]}
+    Returns {"responses": [{"id", "status", "body"}, ...]} in request order.
+
+    Sub-requests are dispatched in-process through the normal routes (so
+    auth, versioning and projections behave exactly as for a direct call)
+    and share this request's app context, DB session and connection. A
+    failing sub-request only fails its own entry, and so does one whose
+    response is a file or binary rather than JSON or text (status 406).
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+    if len(items) > MAX_BATCH_REQUESTS:
+        return jsonify({'error': f'At most {MAX_BATCH_REQUESTS} requests per batch'}), 400
+
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return jsonify({'error': f'requests[{i}] needs a path'}), 400
+        if item.get('method', 'GET').upper() != 'GET':
+            return jsonify({'error': f'requests[{i}]: only GET is supported'}), 400
+        if not item['path'].startswith('/api/') or item['path'].split('?')[0].rstrip('/') == request.path:
+            return jsonify({'error': f'requests[{i}]: path must be an /api/ route other than batch'}), 400
+
+    return jsonify({
+        'responses': [_dispatch(item) for item in items]
+    }), 200
+
+
+def _dispatch(item):
+    path, _, query = item['path'].partition('?')
+    environ = EnvironBuilder(
+        path=path,
+        query_string=query,
+        method='GET',
+        base_url=request.host_url,
+        headers={'Authorization': request.headers.get('Authorization', '')}
+    ).get_environ()
+
+    app = current_app._get_current_object()
+    entry = {'id': item.get('id', item['path'])}
+    # The current app context stays pushed, so every sub-request reuses
+    # this request's scoped session instead of opening its own.
+    with app.request_context(environ):
+        response = None
+        try:
+            response = app.full_dispatch_request()
+            if response.direct_passthrough or not (
+                    response.is_json or response.mimetype.startswith('text/')):
+                # Files and binary bodies (PDFs, ZIPs) can't be embedded in the JSON reply
+                entry.update(status=406, body={'error': 'Response is not JSON or text; request this path directly'})
+                return entry
+
+            entry['status'] = response.status_code
+            entry['body'] = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+        except Exception:
+            current_app.logger.exception('Batch sub-request %s failed', item['path'])
+            db.session.rollback()
+            entry.update(status=500, body={'error': 'Internal server error'})
+        finally:
+            if response is not None:
+                response.close()
+    return entry
@@ -1,23 +1,130 @@
-from flask import Blueprint, request, jsonify
+import zipfile
+from collections import Counter
+from concurrent.futures import as_completed
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.models.paper import Paper
+from app.models.paper import Paper, paper_questions
 from app.models.question import Question
 from app.models.subject import Subject
-from app.services.paper_generator import generate_paper
+from app.services.paper_generator import generate_paper, generate_paper_set
+from app.services import question_pool, table_versions, pdf_cache, pdf_renderer, pdf_workers
+from app.pagination import page_args, paginate
+from app.projection import parse_fields, build_projection
 
 papers_bp = Blueprint('papers', __name__)
 
+EXPORT_MAX_PAPERS = 100
+
+# Sparse fieldsets for GET /api/papers/?fields=...
+# field -> (columns to SELECT, row -> value); mirrors Paper.to_dict
+PAPER_FIELDS = {
+    'id': ([Paper.id], lambda r: r.id),
+    'title': ([Paper.title], lambda r: r.title),
+    'total_marks': ([Paper.total_marks], lambda r: r.total_marks),
+    'duration_minutes': ([Paper.duration_minutes], lambda r: r.duration_minutes),
+    'config': ([Paper.config], lambda r: r.config),
+    'status': ([Paper.status], lambda r: r.status),
+    'subject_id': ([Paper.subject_id], lambda r: r.subject_id),
+    'created_by': ([Paper.created_by], lambda r: r.created_by),
+    'question_count': ([Paper.question_count], lambda r: r.question_count),
+    'created_at': ([Paper.created_at], lambda r: r.created_at.isoformat()),
+}
+
+
+def _paper_with_questions(paper_id):
+    """Load a paper, its questions and their subjects in a fixed number of queries"""
+    return Paper.query.options(
+        db.joinedload(Paper.subject),
+        db.selectinload(Paper.questions).joinedload(Question.subject)
+    ).filter_by(id=paper_id).first_or_404()
+
+
+def _reload_after_commit(paper_ids, question_ids):
+    """
+    Refresh papers and questions expired by commit with one query each
+    (subjects joined), so serializing them doesn't lazy-load row by row.
+    Take the ids before committing: reading them afterwards refreshes
+    each object on its own. Returns {question_id: Question}.
+    """
+    Paper.query.options(db.joinedload(Paper.subject))\
+        .filter(Paper.id.in_(paper_ids)).all()
+    questions = Question.query.options(db.joinedload(Question.subject))\
+        .filter(Question.id.in_(set(question_ids))).all()
+    return {q.id: q for q in questions}
+
+
+def _link_questions(paper_id, question_ids):
+    """Insert paper_questions rows for a paper in one executemany, keeping order"""
+    rows = [
+        {'paper_id': paper_id, 'question_id': qid, 'order': index}
+        for index, qid in enumerate(question_ids)
+    ]
+    if rows:
+        db.session.execute(paper_questions.insert(), rows)
+
+
+def _record_usage(subject_id, question_ids):
+    """
+    Set-based times_used accounting: UPDATE ... SET times_used = times_used + n
+    WHERE id IN (...), so concurrent generations can't lose increments.
+    A question listed n times is bumped by n.
+    Returns the subject's new questions:<id> counter for the pool hook.
+    """
+    if not question_ids:
+        return None
+    versions = table_versions.bump(*table_versions.question_keys(subject_id))
+
+    by_amount = {}
+    for qid, amount in Counter(question_ids).items():
+        by_amount.setdefault(amount, []).append(qid)
+
+    for amount, ids in by_amount.items():
+        db.session.execute(
+            db.update(Question)
+            .where(Question.id.in_(ids))
+            .values(times_used=db.func.coalesce(Question.times_used, 0) + amount)
+            .execution_options(synchronize_session=False)
+        )
+    return versions[table_versions.subject_key(subject_id)]
+
+
+def _config_error(config):
+    """Error message for config values generation can't use, or None"""
+    if not isinstance(config, dict):
+        return 'config must be an object'
+    budget = config.get('time_budget_ms')
+    if budget is not None and (isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0):
+        return 'config.time_budget_ms must be a positive number'
+    return None
+
 
 @papers_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_papers():
-    """Get all papers for current user"""
+    """Get all papers for current user (?limit= / ?cursor= to page, ?fields= to project)"""
     user_id = get_jwt_identity()
-    papers = Paper.query.filter_by(created_by=int(user_id)).all()
+
+    try:
+        fields = parse_fields(PAPER_FIELDS)
+        limit, after_id = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if fields:
+        columns, serialize = build_projection(PAPER_FIELDS, fields)
+        query = db.session.query(*columns)
+    else:
+        query = Paper.query
+        serialize = Paper.to_dict
+
+    query = query.filter(Paper.created_by == int(user_id))
+    papers, next_cursor = paginate(query, Paper.id, limit, after_id)
     return jsonify({
-        'papers': [p.to_dict() for p in papers],
-        'count': len(papers)
+        'papers': [serialize(p) for p in papers],
+        'count': len(papers),
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -25,7 +132,7 @@ def get_papers():
 @jwt_required()
 def get_paper(paper_id):
     """Get single paper with all its questions"""
-    paper = Paper.query.get_or_404(paper_id)
+    paper = _paper_with_questions(paper_id)
 
     paper_data = paper.to_dict()
     paper_data['questions'] = [q.to_dict() for q in paper.questions]
@@ -68,6 +175,10 @@ def create_paper():
     if not all(k in data for k in required):
         return jsonify({'error': f'Required fields: {required}'}), 400
 
+    config_error = _config_error(data['config'])
+    if config_error:
+        return jsonify({'error': config_error}), 400
+
     # Check subject exists
     if not Subject.query.get(data['subject_id']):
         return jsonify({'error': 'Subject not found'}), 404
@@ -95,15 +206,22 @@ def create_paper():
     db.session.add(paper)
     db.session.flush()  # get paper.id before commit
 
-    # Link selected questions to paper
-    for question in result['questions']:
-        paper.questions.append(question)
-        question.times_used = (question.times_used or 0) + 1  # track usage
+    # Link selected questions to paper and track usage
+    question_ids = [q.id for q in result['questions']]
+    _link_questions(paper.id, question_ids)
+    subject_id = paper.subject_id
+    usage_version = _record_usage(subject_id, question_ids)
+    paper_ids = [paper.id]
 
     db.session.commit()
+    question_pool.questions_used(subject_id, question_ids, usage_version)
+
+    by_id = _reload_after_commit(paper_ids, question_ids)
+    questions = [by_id[qid] for qid in question_ids]
+    _prerender(paper, questions)
 
     paper_data = paper.to_dict()
-    paper_data['questions'] = [q.to_dict() for q in paper.questions]
+    paper_data['questions'] = [q.to_dict() for q in questions]
 
     return jsonify({
         'message': 'Paper generated successfully',
@@ -111,6 +229,107 @@ def create_paper():
     }), 201
 
 
+@papers_bp.route('/generate-set', methods=['POST'])
+@jwt_required()
+def create_paper_set():
+    """
+    Generate several variants of a paper (Set A, B, C, ...) in one call.
+    All papers are saved in a single transaction.
+
+    Expected body: same as /generate, plus
+    {
+        "variants": 4,          // number of sets, 1-26
+        "max_overlap": 0.2      // max share of a set's questions another set may repeat
+    }
+    """
+    data = request.get_json()
+    user_id = get_jwt_identity()
+
+    # Validate required fields
+    required = ['title', 'subject_id', 'total_marks', 'duration_minutes', 'config', 'variants']
+    if not all(k in data for k in required):
+        return jsonify({'error': f'Required fields: {required}'}), 400
+
+    config_error = _config_error(data['config'])
+    if config_error:
+        return jsonify({'error': config_error}), 400
+
+    variants = data['variants']
+    max_overlap = data.get('max_overlap', 0)
+
+    if not isinstance(variants, int) or not 1 <= variants <= 26:
+        return jsonify({'error': 'variants must be an integer between 1 and 26'}), 400
+
+    if not isinstance(max_overlap, (int, float)) or not 0 <= max_overlap <= 1:
+        return jsonify({'error': 'max_overlap must be a number between 0 and 1'}), 400
+
+    # Check subject exists
+    if not Subject.query.get(data['subject_id']):
+        return jsonify({'error': 'Subject not found'}), 404
+
+    result = generate_paper_set(
+        subject_id=data['subject_id'],
+        total_marks=data['total_marks'],
+        config=data['config'],
+        variants=variants,
+        max_overlap=max_overlap
+    )
+
+    if not result['success']:
+        return jsonify({'error': result['message']}), 400
+
+    # Save every variant in one transaction
+    papers = []
+    used_ids = []
+    for i, variant in enumerate(result['variants']):
+        paper = Paper(
+            title=f"{data['title']} - Set {chr(ord('A') + i)}",
+            total_marks=variant['total_marks_allocated'],
+            duration_minutes=data['duration_minutes'],
+            config=data['config'],
+            subject_id=data['subject_id'],
+            created_by=int(user_id)
+        )
+        papers.append(paper)
+
+    db.session.add_all(papers)
+    db.session.flush()  # get paper ids before commit
+
+    paper_ids = [paper.id for paper in papers]
+    for paper_id, variant in zip(paper_ids, result['variants']):
+        question_ids = [q.id for q in variant['questions']]
+        _link_questions(paper_id, question_ids)
+        used_ids.extend(question_ids)
+    usage_version = _record_usage(data['subject_id'], used_ids)
+
+    db.session.commit()
+    question_pool.questions_used(data['subject_id'], used_ids, usage_version)
+
+    by_id = _reload_after_commit(paper_ids, used_ids)
+    variant_questions = [[by_id[q.id] for q in variant['questions']] for variant in result['variants']]
+    for paper, questions in zip(papers, variant_questions):
+        _prerender(paper, questions)
+
+    question_sets = [{q.id for q in variant['questions']} for variant in result['variants']]
+    max_shared = max(
+        (len(a & b) for i, a in enumerate(question_sets) for b in question_sets[i + 1:]),
+        default=0
+    )
+
+    papers_data = []
+    for paper, questions in zip(papers, variant_questions):
+        paper_data = paper.to_dict()
+        paper_data['questions'] = [q.to_dict() for q in questions]
+        papers_data.append(paper_data)
+
+    return jsonify({
+        'message': f'{len(papers)} paper variants generated successfully',
+        'papers': papers_data,
+        'count': len(papers),
+        'max_pairwise_overlap': max_shared
+    }), 201
+
+
 @papers_bp.route('/<int:paper_id>', methods=['DELETE'])
 @jwt_required()
 def delete_paper(paper_id):
@@ -119,6 +338,7 @@ def delete_paper(paper_id):
 
     db.session.delete(paper)
     db.session.commit()
+    pdf_cache.get_pdf_cache().invalidate(paper_id)
 
     return jsonify({'message': 'Paper deleted successfully'}), 200
 
@@ -133,35 +353,228 @@ def update_paper(paper_id):
     if 'title' in data:
         paper.title = data['title']
     
+    added_ids = []
+    usage_version = None
     if 'question_ids' in data:
         # Replace questions
         new_questions = Question.query.filter(Question.id.in_(data['question_ids'])).all()
         # Ensure we maintain order if index is provided
         id_map = {q.id: q for q in new_questions}
-        paper.questions = [id_map[qid] for qid in data['question_ids'] if qid in id_map]
-        paper.total_marks = sum(q.marks for q in paper.questions)
+        question_ids = [qid for qid in dict.fromkeys(data['question_ids']) if qid in id_map]
+
+        old_ids = set(db.session.scalars(
+            db.select(paper_questions.c.question_id).where(paper_questions.c.paper_id == paper.id)
+        ))
+        db.session.execute(paper_questions.delete().where(paper_questions.c.paper_id == paper.id))
+        _link_questions(paper.id, question_ids)
+
+        # Only newly added questions count as a fresh use
+        added_ids = [qid for qid in question_ids if qid not in old_ids]
+        usage_version = _record_usage(paper.subject_id, added_ids)
+
+        db.session.expire(paper, ['questions'])
+        paper.total_marks = sum(id_map[qid].marks for qid in question_ids)
 
     db.session.commit()
+    question_pool.questions_used(paper.subject_id, added_ids, usage_version)
+    pdf_cache.get_pdf_cache().invalidate(paper.id)
+    _prerender(paper)
     return jsonify({'message': 'Paper updated successfully', 'paper': paper.to_dict()}), 200
 
 
 @papers_bp.route('/<int:paper_id>/pdf', methods=['GET'])
 @jwt_required()
 def download_paper_pdf(paper_id):
-    """Generate and return PDF for a paper"""
+    """
+    Return the PDF for a paper. Renders are cached on disk by a hash of the
+    paper's content, which doubles as a strong ETag.
+    """
     from flask import send_file
-    from app.services.pdf_generator import generate_paper_pdf
-    
-    paper = Paper.query.get_or_404(paper_id)
-    paper_data = paper.to_dict()
-    paper_data['questions'] = [q.to_dict() for q in paper.questions]
-    paper_data['subject_name'] = paper.subject.name if paper.subject else "Examination"
 
-    pdf_buffer = generate_paper_pdf(paper_data)
-    
-    return send_file(
-        pdf_buffer,
+    paper = _paper_with_questions(paper_id)
+    paper_data = _pdf_data(paper)
+    key = pdf_cache.paper_key(paper_data)
+
+    # Waits for an in-flight background render instead of starting another
+    path = pdf_renderer.get_renderer().get_or_render(paper.id, key, paper_data)
+
+    response = send_file(
+        path,
         mimetype='application/pdf',
         as_attachment=True,
-        download_name=f"{paper.title.replace(' ', '_')}.pdf"
-    )
\ No newline at end of file
+        download_name=f"{paper.title.replace(' ', '_')}.pdf",
+        etag=key,
+        conditional=True
+    )
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@papers_bp.route('/<int:paper_id>/render', methods=['GET'])
+@jwt_required()
+def render_paper(paper_id):
+    """
+    Print-ready rendering of a paper for previews and browser printing.
+    ?format=html (the only format for now; PDFs come from /pdf).
+    """
+    from app.services.html_renderer import render_paper_html
+
+    output_format = request.args.get('format', 'html')
+    if output_format != 'html':
+        return jsonify({'error': "Unsupported format, expected 'html'"}), 400
+
+    paper = _paper_with_questions(paper_id)
+    paper_data = _pdf_data(paper)
+
+    response = current_app.response_class(render_paper_html(paper_data), mimetype='text/html')
+    # Weak: the compression hook may gzip the body after this, and a
+    # strong validator must change with the bytes on the wire
+    response.set_etag(pdf_cache.paper_key(paper_data), weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@papers_bp.route('/export', methods=['POST'])
+@jwt_required()
+def export_papers():
+    """
+    Render several papers and stream them back as one ZIP.
+    Body: {"paper_ids": [1, 2, ...]}
+
+    Renders already in the PDF cache go out first. The rest are rendered in
+    parallel on the PDF process pool and added to the archive as each one
+    finishes, so total time scales with the number of CPUs rather than the
+    number of papers. Papers that fail to render are listed in errors.txt.
+    """
+    data = request.get_json(silent=True) or {}
+    paper_ids = data.get('paper_ids')
+
+    if not isinstance(paper_ids, list) or not paper_ids or not all(isinstance(i, int) for i in paper_ids):
+        return jsonify({'error': 'paper_ids must be a non-empty list of ids'}), 400
+    paper_ids = list(dict.fromkeys(paper_ids))
+    if len(paper_ids) > EXPORT_MAX_PAPERS:
+        return jsonify({'error': f'At most {EXPORT_MAX_PAPERS} papers per export'}), 400
+
+    papers = {p.id: p for p in Paper.query.options(
+        db.joinedload(Paper.subject),
+        db.selectinload(Paper.questions).joinedload(Question.subject)
+    ).filter(Paper.id.in_(paper_ids))}
+    missing = [pid for pid in paper_ids if pid not in papers]
+    if missing:
+        return jsonify({'error': 'Papers not found', 'missing': missing}), 404
+
+    cache = pdf_cache.get_pdf_cache()
+    cached, jobs = [], []
+    for pid in paper_ids:
+        paper_data = _pdf_data(papers[pid])
+        key = pdf_cache.paper_key(paper_data)
+        name = f"{pid}_{papers[pid].title.replace(' ', '_').replace('/', '-')}.pdf"
+        path = cache.get(pid, key)
+        if path is not None:
+            cached.append((name, path))
+        else:
+            jobs.append((pid, key, name, paper_data))
+
+    # Start rendering before the response begins streaming
+    futures = {}
+    inline = []
+    for job in jobs:
+        future = pdf_workers.submit_render(job[3])
+        if future is None:
+            inline.append(job)
+        else:
+            futures[future] = job
+    logger = current_app.logger
+
+    def rendered():
+        for future in as_completed(futures):
+            yield futures[future], future.result
+        for job in inline:
+            yield job, lambda job=job: pdf_workers.render_pdf(job[3])
+
+    def generate():
+        stream = _ZipStream()
+        errors = []
+        try:
+            with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as archive:
+                for name, path in cached:
+                    archive.write(path, name)
+                    yield stream.drain()
+
+                for (pid, key, name, _), result in rendered():
+                    try:
+                        pdf = result()
+                    except Exception:
+                        logger.exception('Export: rendering paper %s failed', pid)
+                        errors.append(f'{name}: render failed')
+                        continue
+                    cache.put(pid, key, pdf)
+                    archive.writestr(name, pdf)
+                    yield stream.drain()
+
+                if errors:
+                    archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+            yield stream.drain()
+        finally:
+            # Client went away: don't keep rendering for nobody
+            for future in futures:
+                future.cancel()
+
+    return Response(
+        generate(),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=papers.zip'}
+    )
+
+
+class _ZipStream:
+    """Write-only, unseekable file object that zipfile writes into and generate() drains"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _pdf_data(paper, questions=None):
+    """
+    Everything generate_paper_pdf draws, as plain data (also the cache key
+    input). Only printed fields are included, so usage counters and other
+    bookkeeping don't change the key. Pass `questions` (in paper order) when
+    they are already loaded.
+    """
+    if questions is None:
+        questions = paper.questions
+    return {
+        'title': paper.title,
+        'total_marks': paper.total_marks,
+        'duration_minutes': paper.duration_minutes,
+        'subject_name': paper.subject.name if paper.subject else "Examination",
+        'date': datetime.now().strftime('%d %B %Y'),
+        'questions': [{
+            'id': q.id,
+            'text': q.text,
+            'question_type': q.question_type,
+            'marks': q.marks,
+            'options': {'a': q.option_a, 'b': q.option_b, 'c': q.option_c, 'd': q.option_d}
+            if q.question_type == 'mcq' else None
+        } for q in questions]
+    }
+
+
+def _prerender(paper, questions=None):
+    """Queue a background render so the first download is usually a cache hit"""
+    if current_app.config.get('PDF_PRERENDER', True):
+        pdf_renderer.get_renderer().prerender(paper.id, _pdf_data(paper, questions))
@@ -1,9 +1,18 @@
+import codecs
+import csv
+import io
+import json
 import os
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.question import Question
 from app.models.subject import Subject
+from app.services import question_pool, table_versions
+from app.conditional import versioned
+from app.pagination import page_args, paginate
+from app.projection import parse_fields, build_projection
 
 questions_bp = Blueprint('questions', __name__)
 
@@ -11,37 +20,232 @@ VALID_BLOOMS = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'creat
 VALID_DIFFICULTY = ['easy', 'medium', 'hard']
 VALID_TYPES = ['mcq', 'short', 'long']
 
+SNIPPET_LENGTH = 120
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000
+IMPORT_OPTIONAL_FIELDS = ['option_a', 'option_b', 'option_c', 'option_d', 'correct_answer']
+
+EXPORT_BATCH_SIZE = 1000
+# CSV export columns; the same layout POST /api/questions/import accepts
+EXPORT_CSV_COLUMNS = ['id', 'text', 'question_type', 'blooms_level', 'difficulty', 'marks',
+                      'subject_id', 'option_a', 'option_b', 'option_c', 'option_d',
+                      'correct_answer', 'times_used', 'created_at']
+
+
+def _list_version_keys():
+    """Version names a question listing depends on (subject names are embedded too)"""
+    subject_id = request.args.get('subject_id', type=int)
+    return ['subjects', f'questions:{subject_id}' if subject_id else 'questions']
+
+
+# Sparse fieldsets for GET /api/questions/?fields=...
+# field -> (columns to SELECT, row -> value); mirrors Question.to_dict
+QUESTION_FIELDS = {
+    'id': ([Question.id], lambda r: r.id),
+    'text': ([Question.text], lambda r: r.text),
+    'text_snippet': ([db.func.substr(Question.text, 1, SNIPPET_LENGTH).label('text_snippet')],
+                     lambda r: r.text_snippet),
+    'question_type': ([Question.question_type], lambda r: r.question_type),
+    'blooms_level': ([Question.blooms_level], lambda r: r.blooms_level),
+    'difficulty': ([Question.difficulty], lambda r: r.difficulty),
+    'marks': ([Question.marks], lambda r: r.marks),
+    'options': ([Question.question_type, Question.option_a, Question.option_b,
+                 Question.option_c, Question.option_d],
+                lambda r: {
+                    'a': r.option_a,
+                    'b': r.option_b,
+                    'c': r.option_c,
+                    'd': r.option_d,
+                } if r.question_type == 'mcq' else None),
+    'correct_answer': ([Question.correct_answer], lambda r: r.correct_answer),
+    'subject_id': ([Question.subject_id], lambda r: r.subject_id),
+    'subject_name': ([Subject.name.label('subject_name')], lambda r: r.subject_name or 'Uncategorized'),
+    'times_used': ([Question.times_used], lambda r: r.times_used),
+    'created_at': ([Question.created_at], lambda r: r.created_at.isoformat()),
+}
+
 
 @questions_bp.route('/', methods=['GET'])
 @jwt_required()
+@versioned(_list_version_keys)
 def get_questions():
-    """Get all questions with optional filters"""
+    """
+    Get questions with optional filters.
+    Pass ?limit= (and the returned next_cursor as ?cursor=) to page through
+    large banks; without limit the full list is returned.
+    Pass ?fields=id,text_snippet,marks,... to select only those columns
+    (no ORM objects are built).
+    """
+    try:
+        fields = parse_fields(QUESTION_FIELDS)
+        limit, after_id = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if fields:
+        columns, serialize = build_projection(QUESTION_FIELDS, fields)
+        query = db.session.query(*columns)
+        if 'subject_name' in fields:
+            query = query.outerjoin(Subject, Subject.id == Question.subject_id)
+    else:
+        query = Question.query.options(db.joinedload(Question.subject))
+        serialize = Question.to_dict
+
+    query = _filter_questions(query)
+    questions, next_cursor = paginate(query, Question.id, limit, after_id)
+
+    return jsonify({
+        'questions': [serialize(q) for q in questions],
+        'count': len(questions),
+        'next_cursor': next_cursor
+    }), 200
+
+
+def _filter_questions(query):
+    """Apply the ?subject_id / blooms_level / difficulty / question_type filters"""
     subject_id = request.args.get('subject_id', type=int)
     blooms_level = request.args.get('blooms_level')
     difficulty = request.args.get('difficulty')
     question_type = request.args.get('question_type')
 
-    query = Question.query
-
     if subject_id:
-        query = query.filter_by(subject_id=subject_id)
+        query = query.filter(Question.subject_id == subject_id)
     if blooms_level:
-        query = query.filter_by(blooms_level=blooms_level)
+        query = query.filter(Question.blooms_level == blooms_level)
     if difficulty:
-        query = query.filter_by(difficulty=difficulty)
+        query = query.filter(Question.difficulty == difficulty)
     if question_type:
-        query = query.filter_by(question_type=question_type)
+        query = query.filter(Question.question_type == question_type)
+    return query
 
-    questions = query.all()
 
-    return jsonify({
-        'questions': [q.to_dict() for q in questions],
-        'count': len(questions)
-    }), 200
+@questions_bp.route('/export', methods=['GET'])
+@jwt_required()
+@versioned(_list_version_keys)
+def export_questions():
+    """
+    Stream the (filtered) question bank as NDJSON, or CSV with ?format=csv.
+
+    Rows are read with yield_per and written in batches of
+    EXPORT_BATCH_SIZE, so memory stays flat however large the bank is.
+    NDJSON rows match GET /api/questions/ (?fields= is supported). CSV
+    uses the column layout that /import accepts.
+    """
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+
+    if fmt == 'csv':
+        columns = [getattr(Question, name) for name in EXPORT_CSV_COLUMNS]
+        query = db.session.query(*columns)
+    else:
+        try:
+            fields = parse_fields(QUESTION_FIELDS) or [f for f in QUESTION_FIELDS if f != 'text_snippet']
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        columns, serialize = build_projection(QUESTION_FIELDS, fields)
+        query = db.session.query(*columns)
+        if 'subject_name' in fields:
+            query = query.outerjoin(Subject, Subject.id == Question.subject_id)
+
+    query = _filter_questions(query).order_by(Question.id).yield_per(EXPORT_BATCH_SIZE)
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        count = 0
+        for row in query:
+            writer.writerow(['' if v is None else (v.isoformat() if isinstance(v, datetime) else v)
+                             for v in row])
+            count += 1
+            # Send the header and first row immediately, then full batches
+            if count == 1 or count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def generate_ndjson():
+        dumps = current_app.json.dumps
+        batch = []
+        first = True
+        for row in query:
+            batch.append(dumps(serialize(row)))
+            # Send the first row immediately, then full batches
+            if first or len(batch) >= EXPORT_BATCH_SIZE:
+                yield '\n'.join(batch) + '\n'
+                batch = []
+                first = False
+        if batch:
+            yield '\n'.join(batch) + '\n'
+
+    if fmt == 'csv':
+        body, mimetype, extension = generate_csv(), 'text/csv', 'csv'
+    else:
+        body, mimetype, extension = generate_ndjson(), 'application/x-ndjson', 'ndjson'
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=questions.{extension}'}
+    )
+
+
+@questions_bp.route('/stats', methods=['GET'])
+@jwt_required()
+@versioned(_list_version_keys)
+def get_question_stats():
+    """
+    Question bank counts grouped by subject, Bloom's level, difficulty,
+    question type and marks. One GROUP BY query (served from the covering
+    selection index); optional ?subject_id= filter.
+    """
+    subject_id = request.args.get('subject_id', type=int)
+
+    query = db.session.query(
+        Question.subject_id,
+        Question.blooms_level,
+        Question.difficulty,
+        Question.question_type,
+        Question.marks,
+        db.func.count()
+    )
+    if subject_id:
+        query = query.filter(Question.subject_id == subject_id)
+
+    rows = query.group_by(
+        Question.subject_id,
+        Question.blooms_level,
+        Question.difficulty,
+        Question.question_type,
+        Question.marks
+    ).all()
+
+    stats = {
+        'total': 0,
+        'by_subject': {},
+        'by_blooms_level': {},
+        'by_difficulty': {},
+        'by_question_type': {},
+        'by_marks': {}
+    }
+    for row_subject, blooms_level, difficulty, question_type, marks, count in rows:
+        stats['total'] += count
+        for group, key in (('by_subject', str(row_subject)),
+                           ('by_blooms_level', blooms_level),
+                           ('by_difficulty', difficulty),
+                           ('by_question_type', question_type),
+                           ('by_marks', str(marks))):
+            stats[group][key] = stats[group].get(key, 0) + count
+
+    return jsonify(stats), 200
 
 
 @questions_bp.route('/<int:question_id>', methods=['GET'])
 @jwt_required()
+@versioned(lambda: ['subjects', 'questions'])
 def get_question(question_id):
     """Get single question by ID"""
     question = Question.query.get_or_404(question_id)
@@ -90,7 +294,9 @@ def create_question():
     )
 
     db.session.add(question)
+    versions = table_versions.bump(*table_versions.question_keys(question.subject_id))
     db.session.commit()
+    question_pool.question_saved(question, versions[table_versions.subject_key(question.subject_id)])
 
     return jsonify({
         'message': 'Question created successfully',
@@ -98,6 +304,180 @@ def create_question():
     }), 201
 
 
+@questions_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_questions():
+    """
+    Bulk import questions from a CSV or JSONL upload.
+
+    Send the file as multipart field "file", or as the raw request body.
+    The format comes from ?format=csv|jsonl, else the file extension or
+    Content-Type. Rows are parsed one at a time, validated like
+    POST /api/questions/, and inserted with executemany in transactions of
+    IMPORT_CHUNK_SIZE rows. ?subject_id= sets a default for rows without one.
+
+    Returns counts plus per-row errors ({"line": n, "error": "..."}).
+    """
+    user_id = int(get_jwt_identity())
+    default_subject_id = request.args.get('subject_id', type=int)
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, filename, content_type = upload.stream, upload.filename or '', upload.mimetype
+    else:
+        stream, filename, content_type = request.stream, '', request.mimetype
+
+    fmt = request.args.get('format')
+    if not fmt:
+        is_csv = filename.lower().endswith('.csv') or content_type == 'text/csv'
+        fmt = 'csv' if is_csv else 'jsonl'
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'error': 'format must be csv or jsonl'}), 400
+
+    subject_ids = {sid for (sid,) in db.session.query(Subject.id)}
+    now = datetime.utcnow()
+
+    imported = 0
+    failed = 0
+    errors = []
+    chunk = []
+
+    def flush(rows):
+        db.session.execute(Question.__table__.insert(), rows)
+        touched = {row['subject_id'] for row in rows}
+        for sid in touched:
+            table_versions.bump(*table_versions.question_keys(sid))
+        db.session.commit()
+        # The chunk is visible now, even if a later row stops the import
+        for sid in touched:
+            question_pool.invalidate(sid)
+
+    for line, raw, parse_error in _iter_import_rows(stream, fmt):
+        error = parse_error
+        row = None
+        if error is None:
+            row, error = _validate_import_row(raw, default_subject_id, subject_ids)
+
+        if error is not None:
+            failed += 1
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({'line': line, 'error': error})
+            continue
+
+        row.update(created_by=user_id, times_used=0, created_at=now)
+        chunk.append(row)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush(chunk)
+            imported += len(chunk)
+            chunk = []
+
+    if chunk:
+        flush(chunk)
+        imported += len(chunk)
+
+    return jsonify({
+        'message': f'Imported {imported} questions',
+        'imported': imported,
+        'failed': failed,
+        'errors': errors,
+        'errors_truncated': failed > len(errors)
+    }), 200 if imported or not failed else 400
+
+
+def _iter_import_rows(stream, fmt):
+    """
+    Yield (line, raw_dict, parse_error) without reading the whole upload.
+
+    A JSONL line that is not UTF-8 or not a JSON object is reported and
+    skipped. The CSV reader can't resync after a bad line (a quoted field
+    may span lines), so a CSV decode or parse error is reported once and
+    ends the import; rows before it are still imported.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(_decoded_lines(stream))
+        while True:
+            try:
+                raw = next(reader)
+            except StopIteration:
+                return
+            except UnicodeDecodeError:
+                yield reader.line_num + 1, None, 'Not valid UTF-8; rows from here on were not imported'
+                return
+            except csv.Error as e:
+                yield reader.line_num, None, f'Invalid CSV: {e}; rows from here on were not imported'
+                return
+            yield reader.line_num, raw, None
+
+    for line, raw_line in enumerate(stream, start=1):
+        if line == 1:
+            raw_line = raw_line.removeprefix(codecs.BOM_UTF8)
+        try:
+            raw_line = raw_line.decode('utf-8')
+        except UnicodeDecodeError:
+            yield line, None, 'Not valid UTF-8'
+            continue
+        if not raw_line.strip():
+            continue
+        try:
+            raw = json.loads(raw_line)
+        except ValueError as e:
+            yield line, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(raw, dict):
+            yield line, None, 'Each line must be a JSON object'
+            continue
+        yield line, raw, None
+
+
+def _decoded_lines(stream):
+    """Decode a binary upload line by line, so a bad byte fails on its own line"""
+    for i, raw_line in enumerate(stream):
+        if i == 0:
+            raw_line = raw_line.removeprefix(codecs.BOM_UTF8)
+        yield raw_line.decode('utf-8')
+
+
+def _validate_import_row(raw, default_subject_id, subject_ids):
+    """Return (row, None) ready for insert, or (None, error message)"""
+    data = {k: (v.strip() if isinstance(v, str) else v) for k, v in raw.items() if k}
+    if not data.get('subject_id') and default_subject_id:
+        data['subject_id'] = default_subject_id
+
+    required = ['text', 'question_type', 'blooms_level', 'difficulty', 'marks', 'subject_id']
+    missing = [k for k in required if data.get(k) in (None, '')]
+    if missing:
+        return None, f'Missing fields: {missing}'
+
+    if data['blooms_level'] not in VALID_BLOOMS:
+        return None, f'blooms_level must be one of {VALID_BLOOMS}'
+    if data['difficulty'] not in VALID_DIFFICULTY:
+        return None, f'difficulty must be one of {VALID_DIFFICULTY}'
+    if data['question_type'] not in VALID_TYPES:
+        return None, f'question_type must be one of {VALID_TYPES}'
+
+    try:
+        marks = int(data['marks'])
+        subject_id = int(data['subject_id'])
+    except (TypeError, ValueError):
+        return None, 'marks and subject_id must be integers'
+    if marks <= 0:
+        return None, 'marks must be positive'
+    if subject_id not in subject_ids:
+        return None, 'Subject not found'
+
+    row = {
+        'text': data['text'],
+        'question_type': data['question_type'],
+        'blooms_level': data['blooms_level'],
+        'difficulty': data['difficulty'],
+        'marks': marks,
+        'subject_id': subject_id,
+    }
+    for key in IMPORT_OPTIONAL_FIELDS:
+        row[key] = data.get(key) or None
+    return row, None
+
+
 @questions_bp.route('/<int:question_id>', methods=['PUT'])
 @jwt_required()
 def update_question(question_id):
@@ -115,7 +495,9 @@ def update_question(question_id):
     question.option_d = data.get('option_d', question.option_d)
     question.correct_answer = data.get('correct_answer', question.correct_answer)
 
+    versions = table_versions.bump(*table_versions.question_keys(question.subject_id))
     db.session.commit()
+    question_pool.question_saved(question, versions[table_versions.subject_key(question.subject_id)])
 
     return jsonify({
         'message': 'Question updated successfully',
@@ -184,8 +566,11 @@ def generate_ai_question():
 def delete_question(question_id):
     """Delete a question"""
     question = Question.query.get_or_404(question_id)
+    subject_id = question.subject_id
 
     db.session.delete(question)
+    versions = table_versions.bump(*table_versions.question_keys(subject_id))
     db.session.commit()
+    question_pool.question_deleted(subject_id, question_id, versions[table_versions.subject_key(subject_id)])
 
     return jsonify({'message': 'Question deleted successfully'}), 200
\ No newline at end of file
@@ -2,12 +2,15 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.subject import Subject
+from app.services import question_pool, table_versions
+from app.conditional import versioned
 
 subjects_bp = Blueprint('subjects', __name__)
 
 
 @subjects_bp.route('/', methods=['GET'])
 @jwt_required()
+@versioned(lambda: ['subjects'])
 def get_subjects():
     """Get all subjects"""
     subjects = Subject.query.all()
@@ -19,6 +22,7 @@ def get_subjects():
 
 @subjects_bp.route('/<int:subject_id>', methods=['GET'])
 @jwt_required()
+@versioned(lambda: ['subjects'])
 def get_subject(subject_id):
     """Get single subject by ID"""
     subject = Subject.query.get_or_404(subject_id)
@@ -45,6 +49,7 @@ def create_subject():
     )
 
     db.session.add(subject)
+    table_versions.bump('subjects')
     db.session.commit()
 
     return jsonify({
@@ -63,6 +68,7 @@ def update_subject(subject_id):
     subject.name = data.get('name', subject.name)
     subject.description = data.get('description', subject.description)
 
+    table_versions.bump('subjects')
     db.session.commit()
 
     return jsonify({
@@ -78,6 +84,8 @@ def delete_subject(subject_id):
     subject = Subject.query.get_or_404(subject_id)
 
     db.session.delete(subject)
+    table_versions.bump('subjects')
     db.session.commit()
+    question_pool.invalidate(subject_id)
 
     return jsonify({'message': 'Subject deleted successfully'}), 200
\ No newline at end of file
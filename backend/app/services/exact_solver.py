@@ -0,0 +1,210 @@
+import time
+
+
+DEFAULT_TIME_BUDGET_MS = 500
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def solve_exact(pool, total_marks, config, exclude=None, cache=None):
+    """
+    Exact mark-sum selection (config["solver"] = "exact").
+
+    Treats selection as a bounded knapsack over (bloom, difficulty, marks)
+    buckets: only the number of questions taken from each bucket is decided,
+    never individual rows. Every (bloom, difficulty) cell gets a target from
+    the distributions, the same way the greedy passes compute it, and the
+    solver looks for a selection that
+      1. reaches total_marks (or the closest total below it),
+      2. minimises the summed deviation from the cell targets,
+      3. never exceeds max_mcqs 1-mark questions.
+
+    Questions whose id is in `exclude` are left out of the buckets.
+
+    Returns a list of PoolEntry (least used first inside each bucket). If
+    config["time_budget_ms"] runs out part-way through, the answer is the
+    best selection over the cells the DP had fully processed (the remaining
+    cells contribute nothing); None if not even one cell was processed, so
+    the caller can keep the greedy answer it already has.
+
+    The per-bucket counts only depend on the config, total_marks and the
+    bucket sizes, not on times_used, so a `cache` (generation_cache.py)
+    can keep them across papers. Only answers found within the budget are
+    cached; the questions are always picked from the pool's current
+    least-used order.
+    """
+    budget_ms = config.get('time_budget_ms')
+    if budget_ms is None:
+        budget_ms = DEFAULT_TIME_BUDGET_MS
+    deadline = time.monotonic() + budget_ms / 1000.0
+
+    blooms_dist = config.get('blooms_distribution', {})
+    difficulty_dist = config.get('difficulty_distribution', {})
+    question_type = config.get('question_type', 'mixed')
+    type_filter = None if question_type == 'mixed' else question_type
+    max_mcqs = config.get('max_mcqs')
+
+    targets = _cell_targets(total_marks, blooms_dist, difficulty_dist)
+
+    bucket_counts = pool.bucket_counts(type_filter, exclude)
+    key = None
+    counts = None
+    if cache is not None:
+        key = cache.make_key(total_marks, config, bucket_counts)
+        counts = cache.get(key)
+
+    if counts is None:
+        # Group bucket counts by (bloom, difficulty) cell -> {marks: count}
+        cells = {}
+        for (blooms_level, difficulty, marks), count in bucket_counts.items():
+            if marks <= 0 or marks > total_marks:
+                continue
+            cells.setdefault((blooms_level, difficulty), {})[marks] = count
+
+        counts, complete = _solve(cells, targets, total_marks, max_mcqs, deadline)
+        if counts is None:
+            return None
+        if key is not None and complete:
+            cache.put(key, counts)
+
+    selected = []
+    for (blooms_level, difficulty, marks), n in counts.items():
+        candidates = pool.candidates(blooms_level=blooms_level, difficulty=difficulty,
+                                     question_type=type_filter, marks=marks, exclude=exclude)
+        selected.extend(q for q, _ in zip(candidates, range(n)))
+    return selected
+
+
+def _cell_targets(total_marks, blooms_dist, difficulty_dist):
+    targets = {}
+    for blooms_level, percentage in blooms_dist.items():
+        target_marks_for_bloom = round((percentage / 100) * total_marks)
+        for difficulty, diff_percentage in difficulty_dist.items():
+            targets[(blooms_level, difficulty)] = round((diff_percentage / 100) * target_marks_for_bloom)
+    return targets
+
+
+def _check(deadline):
+    if time.monotonic() > deadline:
+        raise BudgetExceeded()
+
+
+def _cell_options(marks_counts, limit, max_ones):
+    """
+    Every mark sum (<= limit) one cell can contribute, mapped to the fewest
+    1-mark questions needed to reach it.
+
+    Sums of the multi-mark buckets are found with a bitset bounded knapsack
+    (binary splitting of each bucket count), so the cost depends on the
+    number of buckets and the mark limit, not on the number of questions.
+    """
+    mask = (1 << (limit + 1)) - 1
+    reach = 1
+    for marks, count in marks_counts.items():
+        if marks == 1:
+            continue
+        piece, remaining = 1, count
+        while remaining > 0:
+            take = min(piece, remaining)
+            reach = (reach | (reach << (marks * take))) & mask
+            remaining -= take
+            piece *= 2
+
+    ones = marks_counts.get(1, 0)
+    if max_ones is not None:
+        ones = min(ones, max_ones)
+
+    options = {}
+    for base in range(limit + 1):
+        if not (reach >> base) & 1:
+            continue
+        for k in range(min(ones, limit - base) + 1):
+            total = base + k
+            if total not in options or k < options[total]:
+                options[total] = k
+    return options
+
+
+def _decompose(marks_counts, total, ones):
+    """Bucket counts {marks: n} for a cell that add up to total using `ones` 1-markers"""
+    values = sorted((m for m in marks_counts if m != 1), reverse=True)
+
+    def search(i, remaining):
+        if remaining == 0:
+            return {}
+        if i == len(values):
+            return None
+        marks = values[i]
+        for n in range(min(marks_counts[marks], remaining // marks), -1, -1):
+            rest = search(i + 1, remaining - n * marks)
+            if rest is not None:
+                if n:
+                    rest[marks] = n
+                return rest
+        return None
+
+    result = search(0, total - ones)
+    if ones:
+        result[1] = ones
+    return result
+
+
+def _solve(cells, targets, total_marks, max_mcqs, deadline):
+    """
+    ({(bloom, difficulty, marks): n} for the best selection, whether every
+    cell was processed). The counts are None if the deadline passed before
+    any cell was processed.
+    """
+    options = {}
+    try:
+        for cell, marks_counts in cells.items():
+            _check(deadline)
+            options[cell] = _cell_options(marks_counts, total_marks, max_mcqs)
+    except BudgetExceeded:
+        return None, False
+
+    # DP over cells: reached total -> best (deviation, mcqs used).
+    # Every finished layer is a complete answer for the cells so far, so
+    # running out of time keeps the last finished layer.
+    dp = {0: (0, 0)}
+    back = []
+    order = sorted(options)
+    try:
+        for cell in order:
+            target = targets.get(cell, 0)
+            cell_options = options[cell]
+            nxt = {}
+            choice = {}
+            for reached, (deviation, mcqs) in dp.items():
+                _check(deadline)
+                for marks, ones in cell_options.items():
+                    new_total = reached + marks
+                    if new_total > total_marks:
+                        continue
+                    new_mcqs = mcqs + ones
+                    if max_mcqs is not None and new_mcqs > max_mcqs:
+                        continue
+                    candidate = (deviation + abs(marks - target), new_mcqs)
+                    if new_total not in nxt or candidate < nxt[new_total]:
+                        nxt[new_total] = candidate
+                        choice[new_total] = (reached, marks, ones)
+            dp = nxt
+            back.append(choice)
+    except BudgetExceeded:
+        if not back:
+            return None, False
+
+    # Closest total to the target first, then smallest deviation
+    best_total = max(dp, key=lambda t: (t, -dp[t][0]))
+
+    counts = {}
+    reached = best_total
+    for cell, choice in zip(reversed(order[:len(back)]), reversed(back)):
+        prev, marks, ones = choice[reached]
+        if marks:
+            for bucket_marks, n in _decompose(cells[cell], marks, ones).items():
+                counts[(cell[0], cell[1], bucket_marks)] = n
+        reached = prev
+    return counts, len(back) == len(order)
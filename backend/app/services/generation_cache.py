@@ -0,0 +1,93 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+
+DEFAULT_MAX_ENTRIES = 256
+# The only config keys the exact solver reads
+SOLVER_CONFIG_KEYS = ('blooms_distribution', 'difficulty_distribution', 'question_type', 'max_mcqs')
+
+
+def _normalize(value):
+    """Make equivalent configs hash the same ({1: 20} == {"1": 20.0})"""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def config_hash(config):
+    payload = json.dumps(_normalize(config), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """
+    Bounded LRU of exact-solver answers: how many questions to take from
+    each (bloom, difficulty, marks) bucket.
+
+    Keys are the solver's inputs: the relevant config, total_marks and the
+    bucket sizes. Saving a paper only changes times_used, so an answer stays
+    valid from one paper to the next while the questions picked from each
+    bucket still rotate. Adding, editing or deleting a question changes the
+    bucket sizes and so the key; stale entries age out through normal
+    eviction. Greedy-only generation never consults the cache.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(total_marks, config, bucket_counts):
+        solver_config = {k: config.get(k) for k in SOLVER_CONFIG_KEYS}
+        return (config_hash(solver_config), total_marks, frozenset(bucket_counts.items()))
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key, result):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def get_cache():
+    cache = current_app.extensions.get('generation_cache')
+    if cache is None:
+        size = current_app.config.get('GENERATION_CACHE_SIZE', DEFAULT_MAX_ENTRIES)
+        cache = current_app.extensions.setdefault('generation_cache', GenerationCache(size))
+    return cache
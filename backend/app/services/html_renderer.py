@@ -0,0 +1,33 @@
+import os
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from app.services.pdf_templates import CONTENT_WIDTH, NUMBER_GUTTER, question_label, marks_label, option_label
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+# Standalone environment so the template is compiled once per process,
+# whatever the app's template auto-reload setting.
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False
+)
+_env.globals.update(
+    question_label=question_label,
+    marks_label=marks_label,
+    option_label=option_label,
+    content_width=CONTENT_WIDTH,
+    number_gutter=NUMBER_GUTTER
+)
+_paper_template = _env.get_template('paper_print.html')
+
+
+def render_paper_html(paper_data):
+    """
+    Print-ready HTML for a paper, from the same data as generate_paper_pdf
+    (routes.papers._pdf_data) and with the same numbering, marks and
+    option labels. Question text is escaped, not interpreted as markup.
+    """
+    return _paper_template.render(paper=paper_data)
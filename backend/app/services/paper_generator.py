@@ -1,21 +1,89 @@
 from app.models.question import Question
+from app.services.question_pool import get_pool, invalidate
+from app.services import table_versions
+from app.services.generation_cache import get_cache
+from app.services.exact_solver import solve_exact
 
 
-def generate_paper(subject_id, total_marks, config):
+def generate_paper(subject_id, total_marks, config, exclude=None):
     """
     Smart question selection algorithm with three modes:
     1. Custom Mode: Pick exact count of questions per mark value.
     2. Smart Mode Pass 1: Select questions respecting Bloom's and Difficulty.
     3. Smart Mode Pass 2: Backfill remaining marks from the subject pool.
+
+    With config["solver"] = "exact", smart mode also runs the bounded knapsack
+    solver (exact_solver.py) and uses its answer. If config["time_budget_ms"]
+    cuts the solver short, its partial answer is only used when it reaches
+    at least the greedy total.
+
+    Selection runs against the in-memory subject pool (see question_pool.py),
+    so a warm worker only touches the DB to read the subject's counter and
+    to load the chosen questions. A pool behind the counter is reloaded,
+    and if the DB no longer has every chosen question (a write the pool
+    has not seen yet) the pool is reloaded and selection runs again.
+    The exact solver's per-bucket counts are cached (see generation_cache.py),
+    so repeated exact requests skip the DP while still rotating through the
+    least used questions.
+    """
+    db_version = _bank_version(subject_id)
+    result = select_questions(get_pool(subject_id, db_version), total_marks, config, exclude)
+    if not result['success']:
+        return result
+
+    questions = load_questions(result['questions'])
+    if len(questions) < len(result['questions']):
+        # The pool listed questions the DB no longer has: never return a short paper
+        invalidate(subject_id)
+        result = select_questions(get_pool(subject_id), total_marks, config, exclude)
+        if not result['success']:
+            return result
+        questions = load_questions(result['questions'])
+
+    if not questions:
+        return {
+            'success': False,
+            'message': 'Not enough questions in the bank matching your criteria.'
+        }
+
+    result['questions'] = questions
+    result['total_marks_allocated'] = sum(q.marks for q in questions)
+    result['total_questions'] = len(questions)
+    return result
+
+
+def _bank_version(subject_id):
+    """
+    DB-backed questions:<subject_id> counter. Every question write and every
+    saved paper bumps it in the same transaction, so all workers agree on it.
     """
+    name = table_versions.subject_key(subject_id)
+    return table_versions.get_many([name])[name][0]
+
 
+def load_questions(entries):
+    """Load Question rows for selected pool entries in one query, keeping their order"""
+    if not entries:
+        return []
+    loaded = Question.query.filter(Question.id.in_([e.id for e in entries])).all()
+    by_id = {q.id: q for q in loaded}
+    return [by_id[e.id] for e in entries if e.id in by_id]
+
+
+def select_questions(pool, total_marks, config, exclude=None):
+    """
+    Run the selection modes against a subject pool without touching the DB.
+    Questions whose id is in `exclude` are never picked. Returns the same
+    shape as generate_paper, with PoolEntry items in 'questions'.
+    """
     custom_dist = config.get('custom_distribution') # e.g., {1: 20, 3: 10, 5: 10, 10: 10}
     max_mcqs = config.get('max_mcqs') # e.g., 10
     
     selected_questions = []
-    used_ids = set()
+    used_ids = set(exclude or ())
     marks_allocated = 0
     mcq_count = 0
+    solver_used = 'greedy'
 
     # MODE 1: Custom Explicit Distribution
     if custom_dist:
@@ -31,12 +99,10 @@ def generate_paper(subject_id, total_marks, config):
                         'message': f'Manual structure exceeds MCQ limit: {count} requested, but max is {max_mcqs}.'
                     }
             
-            # Query pool for this mark value
-            query = Question.query.filter_by(subject_id=subject_id, marks=int(marks))
-            # Prefer least used
-            pool = query.order_by(Question.times_used.asc()).limit(actual_count).all()
+            # Pool for this mark value, least used first
+            candidates = pool.candidates(marks=int(marks), exclude=used_ids)
             
-            for q in pool:
+            for q, _ in zip(candidates, range(actual_count)):
                 selected_questions.append(q)
                 used_ids.add(q.id)
                 marks_allocated += q.marks
@@ -51,25 +117,24 @@ def generate_paper(subject_id, total_marks, config):
         blooms_dist = config.get('blooms_distribution', {})
         difficulty_dist = config.get('difficulty_distribution', {})
         question_type = config.get('question_type', 'mixed')
+        type_filter = None if question_type == 'mixed' else question_type
 
         # Pass 1: Strict distribution-based selection
         for blooms_level, percentage in blooms_dist.items():
             target_marks_for_bloom = round((percentage / 100) * total_marks)
             bloom_marks_allocated = 0
 
-            query = Question.query.filter_by(subject_id=subject_id, blooms_level=blooms_level)
-            if question_type != 'mixed':
-                query = query.filter_by(question_type=question_type)
-            
-            bloom_pool = query.order_by(Question.times_used.asc()).all()
-
             for difficulty, diff_percentage in difficulty_dist.items():
                 target_for_bucket = round((diff_percentage / 100) * target_marks_for_bloom)
                 bucket_marks = 0
 
-                bucket_pool = [q for q in bloom_pool if q.difficulty == difficulty and q.id not in used_ids]
+                bucket_pool = pool.candidates(blooms_level=blooms_level, difficulty=difficulty,
+                                              question_type=type_filter, exclude=used_ids)
 
                 for q in bucket_pool:
+                    if bucket_marks >= target_for_bucket or marks_allocated >= total_marks:
+                        break
+
                     # Check MCQ limit for 1-mark questions
                     if q.marks == 1 and max_mcqs is not None and mcq_count >= max_mcqs:
                         continue
@@ -85,14 +150,13 @@ def generate_paper(subject_id, total_marks, config):
 
         # Pass 2: Backfill Pass (if we are under total_marks)
         if marks_allocated < total_marks:
-            remaining_pool = Question.query.filter_by(subject_id=subject_id)\
-                .filter(~Question.id.in_(used_ids))\
-                .order_by(Question.times_used.asc(), Question.marks.desc()).all()
-
-            if question_type != 'mixed':
-                remaining_pool = [q for q in remaining_pool if q.question_type == question_type]
+            remaining_pool = pool.candidates(question_type=type_filter, exclude=used_ids,
+                                             order='usage_marks')
 
             for q in remaining_pool:
+                if marks_allocated >= total_marks:
+                    break
+
                 # Check MCQ limit for 1-mark questions
                 if q.marks == 1 and max_mcqs is not None and mcq_count >= max_mcqs:
                     continue
@@ -104,6 +168,15 @@ def generate_paper(subject_id, total_marks, config):
                     if q.marks == 1:
                         mcq_count += 1
 
+        # Exact solver: replaces the greedy answer unless it ran out of time
+        # with a smaller total than greedy reached
+        if config.get('solver') == 'exact':
+            exact = solve_exact(pool, total_marks, config, exclude, cache=get_cache())
+            if exact is not None and sum(q.marks for q in exact) >= marks_allocated:
+                selected_questions = exact
+                marks_allocated = sum(q.marks for q in exact)
+                solver_used = 'exact'
+
     # Finalization
     if not selected_questions:
         return {
@@ -124,5 +197,98 @@ def generate_paper(subject_id, total_marks, config):
         'success': True,
         'questions': selected_questions,
         'total_marks_allocated': marks_allocated,
-        'total_questions': len(selected_questions)
-    }
\ No newline at end of file
+        'total_questions': len(selected_questions),
+        'solver': solver_used
+    }
+
+def generate_paper_set(subject_id, total_marks, config, variants, max_overlap):
+    """
+    Generate several variants of one paper (Set A, B, C, ...) from a single
+    pool load.
+
+    Each variant first avoids every question already used by earlier
+    variants. If that leaves it short of total_marks, it may reuse questions
+    from earlier sets, but never more than max_overlap (a fraction 0-1) of
+    any earlier set's questions. All variants are loaded from the DB with
+    one query at the end. Like generate_paper, the whole set is selected
+    again from a reloaded pool if the DB is missing any chosen question.
+    """
+    result = _select_variants(get_pool(subject_id, _bank_version(subject_id)),
+                              total_marks, config, variants, max_overlap)
+    if not result['success']:
+        return result
+    by_id = _load_variants(result['variants'])
+
+    if by_id is None:
+        invalidate(subject_id)
+        result = _select_variants(get_pool(subject_id), total_marks, config, variants, max_overlap)
+        if not result['success']:
+            return result
+        by_id = _load_variants(result['variants']) or {}
+
+    selections = result['variants']
+    for result in selections:
+        result['questions'] = [by_id[e.id] for e in result['questions'] if e.id in by_id]
+        result['total_marks_allocated'] = sum(q.marks for q in result['questions'])
+        result['total_questions'] = len(result['questions'])
+
+    return {'success': True, 'variants': selections}
+
+
+def _select_variants(pool, total_marks, config, variants, max_overlap):
+    selections = []
+    for i in range(variants):
+        taken = set()
+        for earlier in selections:
+            taken.update(q.id for q in earlier['questions'])
+
+        result = select_questions(pool, total_marks, config, exclude=taken)
+
+        short = not result['success'] or result['total_marks_allocated'] < total_marks
+        if short and selections and max_overlap > 0:
+            reusable = _reusable_ids(selections, max_overlap)
+            retry = select_questions(pool, total_marks, config, exclude=taken - reusable)
+            if retry['success'] and (not result['success'] or
+                                     retry['total_marks_allocated'] > result['total_marks_allocated']):
+                result = retry
+
+        if not result['success']:
+            return {
+                'success': False,
+                'message': f"Could not build variant {i + 1}: {result['message']}"
+            }
+        selections.append(result)
+    return {'success': True, 'variants': selections}
+
+
+def _load_variants(selections):
+    """{id: Question} for the union of all variants in one query, or None if any is gone"""
+    unique = {}
+    for result in selections:
+        for entry in result['questions']:
+            unique.setdefault(entry.id, entry)
+    by_id = {q.id: q for q in load_questions(list(unique.values()))}
+    return by_id if len(by_id) == len(unique) else None
+
+
+def _reusable_ids(selections, max_overlap):
+    """
+    Questions from earlier variants that a new variant may repeat while
+    keeping its overlap with every earlier variant within max_overlap.
+    Questions used by the fewest earlier variants are offered first.
+    """
+    limits = [int(max_overlap * len(result['questions'])) for result in selections]
+    allowance = [0] * len(selections)
+
+    used_in = {}
+    for index, result in enumerate(selections):
+        for entry in result['questions']:
+            used_in.setdefault(entry.id, []).append(index)
+
+    reusable = set()
+    for question_id, indexes in sorted(used_in.items(), key=lambda item: (len(item[1]), item[0])):
+        if all(allowance[j] < limits[j] for j in indexes):
+            reusable.add(question_id)
+            for j in indexes:
+                allowance[j] += 1
+    return reusable
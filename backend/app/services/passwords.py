@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the bcrypt pool stays saturated for longer than the queue timeout"""
+    pass
+
+
+class PasswordHasher:
+    """
+    Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so capping the number of hashes
+    in flight at BCRYPT_WORKERS keeps a login burst from eating every core
+    while list/detail requests queue behind it. At most BCRYPT_MAX_PENDING
+    more calls wait for a worker; anything beyond that waits up to
+    BCRYPT_QUEUE_TIMEOUT seconds for a slot and then gets PasswordHasherBusy.
+    """
+
+    def __init__(self, workers=2, max_pending=32, queue_timeout=5):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._queue_timeout = queue_timeout
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(timeout=self._queue_timeout):
+            raise PasswordHasherBusy()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+
+def _hasher():
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        hasher = current_app.extensions.setdefault('password_hasher', PasswordHasher(
+            workers=current_app.config.get('BCRYPT_WORKERS', 2),
+            max_pending=current_app.config.get('BCRYPT_MAX_PENDING', 32),
+            queue_timeout=current_app.config.get('BCRYPT_QUEUE_TIMEOUT', 5)
+        ))
+    return hasher
+
+
+def set_password(user, password):
+    """User.set_password on the bcrypt pool"""
+    _hasher().run(user.set_password, password)
+
+
+def check_password(user, password):
+    """User.check_password on the bcrypt pool"""
+    return _hasher().run(user.check_password, password)
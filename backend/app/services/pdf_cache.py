@@ -0,0 +1,133 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from flask import current_app
+from app.services.pdf_templates import LAYOUT_VERSION
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def paper_key(paper_data):
+    """Content hash of the serialized paper (everything the PDF is drawn from) and the layout"""
+    payload = json.dumps([LAYOUT_VERSION, paper_data], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PdfCache:
+    """
+    Disk-backed cache of rendered paper PDFs.
+
+    Files are named <paper_id>-<content hash>.pdf, so a changed paper
+    simply misses, and every rendering of one paper can be dropped by id
+    (invalidate). Hits touch the file's mtime; when the directory grows
+    past max_bytes the least recently used files are deleted. The
+    directory can be shared by several worker processes.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(size for _, _, size in self._files())
+
+    def _path(self, paper_id, key):
+        return os.path.join(self.directory, f'{paper_id}-{key}.pdf')
+
+    def get(self, paper_id, key):
+        """Path of the cached PDF, or None"""
+        path = self._path(paper_id, key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def contains(self, paper_id, key):
+        """Existence check that doesn't count as a lookup or refresh recency"""
+        return os.path.exists(self._path(paper_id, key))
+
+    def put(self, paper_id, key, data):
+        """Store rendered bytes atomically and return the file path"""
+        path = self._path(paper_id, key)
+        os.makedirs(self.directory, exist_ok=True)  # tmp cleaners may remove it
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def invalidate(self, paper_id):
+        """Drop every cached rendering of a paper (after it is edited or deleted)"""
+        for path in glob.glob(os.path.join(self.directory, f'{paper_id}-*.pdf')):
+            self._remove(path)
+
+    def _evict(self, keep):
+        # Re-scan: other processes may have added or removed files
+        files = sorted(self._files(), key=lambda f: f[1])
+        total = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if total <= self.max_bytes:
+                break
+            if path != keep and self._remove(path, locked=True):
+                total -= size
+        self._bytes = total
+
+    def _remove(self, path, locked=False):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        if not locked:
+            with self._lock:
+                self._bytes -= size
+        return True
+
+    def _files(self):
+        """(path, mtime, size) for every cached PDF"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pdf'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_mtime, stat.st_size))
+        return files
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'directory': self.directory,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def get_pdf_cache():
+    cache = current_app.extensions.get('pdf_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('pdf_cache', PdfCache(
+            current_app.config['PDF_CACHE_DIR'],
+            current_app.config.get('PDF_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        ))
+    return cache
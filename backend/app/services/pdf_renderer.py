@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from flask import current_app
+from app.services.pdf_cache import get_pdf_cache, paper_key
+from app.services.pdf_workers import render_pdf
+
+
+class PdfRenderer:
+    """
+    Single-flight rendering into the PDF cache.
+
+    At most one render per (paper id, content hash) runs at a time: a
+    download that finds a render already in flight (a background
+    pre-render or another download) waits for it instead of starting a
+    duplicate. Pre-renders run on a small in-process thread pool so
+    create/update requests return immediately. A pre-render only claims
+    its slot once a pool thread picks it up, so a download never waits
+    behind pre-renders that are still queued.
+    """
+
+    def __init__(self, cache, workers=1):
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pdf-prerender')
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._queued = set()
+        self.prerenders = 0
+        self.waits = 0
+
+    def get_or_render(self, paper_id, key, paper_data):
+        """Path of the cached PDF, rendering (or waiting for a render) on a miss"""
+        path = self.cache.get(paper_id, key)
+        if path is not None:
+            return path
+
+        future, owner = self._claim(paper_id, key)
+        if owner:
+            self._render(paper_id, key, paper_data, future)
+        else:
+            with self._lock:
+                self.waits += 1
+        return future.result()
+
+    def prerender(self, paper_id, paper_data):
+        """Queue a background render unless the PDF is cached or already rendering"""
+        key = paper_key(paper_data)
+        if self.cache.contains(paper_id, key):
+            return
+        with self._lock:
+            if (paper_id, key) in self._queued or (paper_id, key) in self._in_flight:
+                return
+            self._queued.add((paper_id, key))
+        self._executor.submit(self._prerender, paper_id, key, paper_data)
+
+    def _prerender(self, paper_id, key, paper_data):
+        with self._lock:
+            self._queued.discard((paper_id, key))
+        future, owner = self._claim(paper_id, key)
+        if owner:
+            with self._lock:
+                self.prerenders += 1
+            self._render(paper_id, key, paper_data, future)
+
+    def _claim(self, paper_id, key):
+        """(future, owner) - owner is True when the caller has to do the render"""
+        with self._lock:
+            future = self._in_flight.get((paper_id, key))
+            if future is not None:
+                return future, False
+            future = Future()
+            self._in_flight[(paper_id, key)] = future
+            return future, True
+
+    def _render(self, paper_id, key, paper_data, future):
+        try:
+            # A render that finished between the cache miss and the claim
+            if self.cache.contains(paper_id, key):
+                future.set_result(self.cache.get(paper_id, key))
+            else:
+                future.set_result(self.cache.put(paper_id, key, render_pdf(paper_data)))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop((paper_id, key), None)
+
+    def stats(self):
+        return {
+            'in_flight': len(self._in_flight),
+            'queued': len(self._queued),
+            'prerenders': self.prerenders,
+            'waits': self.waits
+        }
+
+
+def get_renderer():
+    renderer = current_app.extensions.get('pdf_renderer')
+    if renderer is None:
+        renderer = current_app.extensions.setdefault('pdf_renderer', PdfRenderer(
+            get_pdf_cache(),
+            workers=current_app.config.get('PDF_PRERENDER_WORKERS', 1)
+        ))
+    return renderer
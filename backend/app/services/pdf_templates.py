@@ -0,0 +1,213 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+
+# Printable width of an A4 page with the generator's 50pt margins
+CONTENT_WIDTH = 490
+# Left gutter the question number hangs in; wide enough for "Q999."
+NUMBER_GUTTER = 40
+MEMO_SIZE = 4096
+# Bump when the rendered layout changes, so cached PDFs are re-rendered
+LAYOUT_VERSION = 3
+
+
+def question_label(number):
+    """Numbering shared by every paper renderer (PDF and HTML)"""
+    return f"Q{number}."
+
+
+def marks_label(marks):
+    return f"({marks} pts)"
+
+
+def option_label(key):
+    return f"{key.upper()})"
+
+
+class _MemoParagraph(Paragraph):
+    """
+    Paragraph whose line breaking is done once per available width and
+    shared by every copy. breakLines is most of the cost of rendering a
+    paper, and a question's lines don't depend on where it appears
+    (its number is drawn as a bullet in the gutter, outside the text).
+
+    split() and drawing edit blPara in place, so the memo keeps a pristine
+    copy and every wrap hands the paragraph a deep copy of it.
+    """
+
+    # Set on memoized prototypes only; halves produced by split() wrap normally
+    _wraps = None
+
+    def wrap(self, availWidth, availHeight):
+        if self._wraps is None:
+            return super().wrap(availWidth, availHeight)
+        cached = self._wraps.get(availWidth)
+        if cached is None:
+            width, height = super().wrap(availWidth, availHeight)
+            self._wraps[availWidth] = (copy.deepcopy(self.blPara), height, list(self._wrapWidths))
+            return width, height
+        blPara, height, wrapWidths = cached
+        self.width = availWidth
+        self.blPara = copy.deepcopy(blPara)
+        self.height = height
+        self._wrapWidths = list(wrapWidths)
+        return availWidth, self.height
+
+
+def _memo_paragraph(text, style):
+    paragraph = _MemoParagraph(text, style)
+    paragraph._wraps = {}
+    return paragraph
+
+
+class PaperTemplate:
+    """
+    Everything about a paper's layout that doesn't depend on the paper:
+    styles, the header table style and the separator rule. Built once per
+    process (get_template), also in PDF worker processes.
+
+    Question flowables are memoized by (question id, content hash). Each
+    render gets shallow copies of the memoized prototypes plus its own
+    copy of their line breaks, so concurrent builds only share the parsed
+    text, which nothing edits.
+    """
+
+    def __init__(self, memo_size=MEMO_SIZE):
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+
+        self.title_style = ParagraphStyle(
+            'TitleStyle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=12,
+            alignment=1,  # Center
+            fontName='Helvetica-Bold'
+        )
+
+        self.question_style = ParagraphStyle(
+            'QuestionStyle',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceBefore=12,
+            spaceAfter=6,
+            leading=14,
+            fontName='Helvetica',
+            leftIndent=NUMBER_GUTTER,
+            bulletIndent=0,
+            bulletFontName='Helvetica-Bold',
+            bulletFontSize=11
+        )
+
+        self.option_style = ParagraphStyle(
+            'OptionStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            leftIndent=NUMBER_GUTTER + 20,
+            spaceBefore=2,
+            fontName='Helvetica'
+        )
+
+        self.header_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ])
+        self._separator = Table([[""]], colWidths=[CONTENT_WIDTH], rowHeights=[1],
+                                style=[('LINEBELOW', (0, 0), (-1, -1), 1, colors.black)])
+
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def header(self, paper_data, date):
+        """Title, subject / marks / duration / date table and separator"""
+        header_data = [
+            [f"Subject: {paper_data.get('subject_name', 'Examination')}", ""],
+            [f"Total Marks: {paper_data['total_marks']}", f"Duration: {paper_data['duration_minutes']} minutes"],
+            [f"Date: {date}", ""]
+        ]
+        header_table = Table(header_data, colWidths=[300, 190])
+        header_table.setStyle(self.header_table_style)
+        return [
+            Paragraph(paper_data['title'], self.title_style),
+            Spacer(1, 12),
+            header_table,
+            Spacer(1, 20),
+            copy.copy(self._separator),
+            Spacer(1, 20),
+        ]
+
+    def empty_notice(self):
+        return [Paragraph("No questions available in this paper.", self.normal_style)]
+
+    def question(self, q, number):
+        """Flowables for one question (text, MCQ options, trailing space)"""
+        prototypes = self._prototypes(q)
+        flowables = [copy.copy(f) for f in prototypes]
+        flowables[0].bulletText = question_label(number)
+        return flowables
+
+    def _prototypes(self, q):
+        text = f"{q['text']} <font color='grey' size='9'>{marks_label(q['marks'])}</font>"
+        options = []
+        if q['question_type'] == 'mcq' and q.get('options'):
+            opts = q['options']
+            options = [f"{option_label(key)} {opts[key]}" for key in ['a', 'b', 'c', 'd'] if opts.get(key)]
+
+        digest = hashlib.sha1('\x00'.join([text] + options).encode('utf-8')).hexdigest()
+        key = (q.get('id'), digest)
+
+        with self._lock:
+            prototypes = self._memo.get(key)
+            if prototypes is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return prototypes
+            self.misses += 1
+
+        prototypes = [_memo_paragraph(text, self.question_style)]
+        prototypes.extend(_memo_paragraph(option, self.option_style) for option in options)
+        prototypes.append(Spacer(1, 8))
+
+        with self._lock:
+            self._memo[key] = prototypes
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return prototypes
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._memo),
+            'max_entries': self.memo_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_template():
+    """The process-wide PaperTemplate, built on first use"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = PaperTemplate()
+    return _template
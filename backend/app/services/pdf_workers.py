@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+
+
+def render_pdf(paper_data):
+    """
+    Render one paper to PDF bytes. Module-level so it can be pickled and
+    run in a worker process.
+    """
+    from app.services.pdf_generator import generate_paper_pdf
+    return generate_paper_pdf(paper_data).getvalue()
+
+
+def get_process_pool():
+    """
+    Per-app process pool for CPU-bound PDF rendering, or None when
+    PDF_RENDER_PROCESSES is 0 (render inline, e.g. on serverless hosts).
+
+    Workers are spawned rather than forked, so they never inherit the
+    web server's threads, locks or DB connections. Spawned workers
+    re-import the main module, so entry scripts must keep their server
+    start-up under `if __name__ == '__main__'` (run.py does).
+    """
+    if 'pdf_process_pool' not in current_app.extensions:
+        processes = current_app.config.get('PDF_RENDER_PROCESSES')
+        if processes is None:
+            processes = os.cpu_count() or 1
+        pool = None
+        if processes > 0:
+            pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+        current_app.extensions.setdefault('pdf_process_pool', pool)
+    return current_app.extensions['pdf_process_pool']
+
+
+def submit_render(paper_data):
+    """
+    Queue render_pdf on the process pool; returns a Future, or None when
+    rendering is configured to happen inline. A pool left broken by a
+    crashed worker is replaced once before giving up.
+    """
+    pool = get_process_pool()
+    if pool is None:
+        return None
+    try:
+        return pool.submit(render_pdf, paper_data)
+    except BrokenProcessPool:
+        current_app.extensions.pop('pdf_process_pool', None)
+        pool.shutdown(wait=False, cancel_futures=True)
+        return get_process_pool().submit(render_pdf, paper_data)
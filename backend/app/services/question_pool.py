@@ -0,0 +1,330 @@
+import heapq
+import threading
+from collections import namedtuple
+from flask import current_app
+from app.extensions import db
+from app.models.question import Question
+from app.models.table_version import TableVersion
+from app.services import table_versions
+
+
+# Lightweight snapshot of the columns selection actually reads.
+# Pools never hold ORM objects, so they are safe to share across requests.
+PoolEntry = namedtuple('PoolEntry', ['id', 'blooms_level', 'difficulty', 'question_type', 'marks', 'times_used'])
+
+
+def _usage_key(entry):
+    """Least used first, ties broken by id (matches the old ORDER BY times_used)"""
+    return (entry.times_used, entry.id)
+
+
+def _entry_from_question(question):
+    return PoolEntry(
+        id=question.id,
+        blooms_level=question.blooms_level,
+        difficulty=question.difficulty,
+        question_type=question.question_type,
+        marks=question.marks,
+        times_used=question.times_used or 0
+    )
+
+
+class SubjectPool:
+    """
+    In-memory index of one subject's question bank.
+
+    Questions are bucketed by (blooms_level, difficulty, question_type, marks)
+    and every bucket is kept sorted least-used first. Writers build a new
+    bucket map and swap it in under the lock, so readers grab self._buckets
+    once and can keep iterating that snapshot while another request writes.
+
+    db_version is the table_versions questions:<subject_id> counter the
+    rows were loaded at. Writes from this process advance it as they are
+    applied; a write made by another process leaves it behind the DB, and
+    the registry then reloads the pool.
+    """
+
+    def __init__(self, subject_id, entries, db_version=0):
+        self.subject_id = subject_id
+        self.db_version = db_version
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._buckets = {}
+
+        grouped = {}
+        for entry in entries:
+            self._entries[entry.id] = entry
+            grouped.setdefault(self._bucket_key(entry), []).append(entry)
+        for key, bucket in grouped.items():
+            self._buckets[key] = sorted(bucket, key=_usage_key)
+
+    @staticmethod
+    def _bucket_key(entry):
+        return (entry.blooms_level, entry.difficulty, entry.question_type, entry.marks)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, question_id):
+        return question_id in self._entries
+
+    def candidates(self, blooms_level=None, difficulty=None, question_type=None, marks=None,
+                   exclude=None, order='usage'):
+        """
+        Yield entries matching the given filters (None = any), least used first.
+
+        order='usage'        -> times_used asc, id asc
+        order='usage_marks'  -> times_used asc, marks desc (backfill order)
+        """
+        wanted = (blooms_level, difficulty, question_type, marks)
+        buckets = [
+            bucket for key, bucket in self._buckets.items()
+            if all(w is None or w == k for w, k in zip(wanted, key))
+        ]
+
+        if order == 'usage_marks':
+            merged = heapq.merge(*buckets, key=lambda e: (e.times_used, -e.marks, e.id))
+        else:
+            merged = heapq.merge(*buckets, key=_usage_key)
+
+        for entry in merged:
+            if exclude and entry.id in exclude:
+                continue
+            yield entry
+
+    def bucket_counts(self, question_type=None, exclude=None):
+        """{(blooms_level, difficulty, marks): count}, optionally for one question type"""
+        counts = {}
+        buckets, entries = self._buckets, self._entries
+        for (blooms_level, difficulty, qtype, marks), bucket in buckets.items():
+            if question_type is not None and qtype != question_type:
+                continue
+            key = (blooms_level, difficulty, marks)
+            counts[key] = counts.get(key, 0) + len(bucket)
+
+        for question_id in exclude or ():
+            entry = entries.get(question_id)
+            if entry is None or (question_type is not None and entry.question_type != question_type):
+                continue
+            key = (entry.blooms_level, entry.difficulty, entry.marks)
+            counts[key] -= 1
+        return counts
+
+    def _advance(self, db_version):
+        """
+        Whether a write stamped with db_version still has to be applied
+        (caller holds the lock). Writes the loaded rows already contain are
+        skipped. If a write from another process is missing in between,
+        the write is applied but db_version stays behind, so get() reloads.
+        """
+        if db_version is None:
+            return True
+        if db_version <= self.db_version:
+            return False
+        if db_version == self.db_version + 1:
+            self.db_version = db_version
+        return True
+
+    def upsert(self, entry, db_version=None):
+        """Insert a new entry or move an existing one to its (possibly new) bucket"""
+        with self._lock:
+            if not self._advance(db_version):
+                return
+            buckets = dict(self._buckets)
+            old = self._entries.get(entry.id)
+            if old is not None:
+                self._remove_from_bucket(buckets, old)
+            self._entries[entry.id] = entry
+            key = self._bucket_key(entry)
+            buckets[key] = sorted(buckets.get(key, []) + [entry], key=_usage_key)
+            self._buckets = buckets
+
+    def discard(self, question_id, db_version=None):
+        with self._lock:
+            if not self._advance(db_version):
+                return
+            old = self._entries.pop(question_id, None)
+            if old is not None:
+                buckets = dict(self._buckets)
+                self._remove_from_bucket(buckets, old)
+                self._buckets = buckets
+
+    def record_usage(self, question_ids, db_version=None):
+        """Bump times_used for questions that were just put on a paper"""
+        with self._lock:
+            if not self._advance(db_version):
+                return
+            touched = set()
+            for qid in question_ids:
+                old = self._entries.get(qid)
+                if old is None:
+                    continue
+                self._entries[qid] = old._replace(times_used=old.times_used + 1)
+                touched.add(self._bucket_key(old))
+
+            buckets = dict(self._buckets)
+            for key in touched:
+                bucket = [self._entries[e.id] for e in buckets.get(key, [])]
+                buckets[key] = sorted(bucket, key=_usage_key)
+            self._buckets = buckets
+
+    def _remove_from_bucket(self, buckets, entry):
+        key = self._bucket_key(entry)
+        remaining = [e for e in buckets.get(key, []) if e.id != entry.id]
+        if remaining:
+            buckets[key] = remaining
+        else:
+            buckets.pop(key, None)
+
+
+class PoolRegistry:
+    """
+    Process-level map of subject_id -> SubjectPool, one per Flask app.
+    Also keeps a per-subject bank version that changes on every question
+    create, update, delete or usage, so caches can tell when a bank has
+    changed.
+
+    Pools are loaded outside the lock. A load is only published if the
+    subject's version did not move while it ran; otherwise a write
+    committed mid-load may be missing from the rows, so it loads again.
+    Write hooks bump the version before peeking, so a write either lands
+    on the published pool or forces the reload.
+
+    get() also takes the subject's DB counter (see SubjectPool.db_version)
+    and reloads a pool that is behind it, which is how writes made by other
+    worker processes reach this one.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pools = {}
+        self._versions = {}
+        self._generation = 0
+
+    def get(self, subject_id, db_version=None):
+        pool = self._pools.get(subject_id)
+        if _current(pool, db_version):
+            return pool
+
+        while True:
+            with self._lock:
+                pool = self._pools.get(subject_id)
+                if _current(pool, db_version):
+                    return pool
+                seen = (self._generation, self.version(subject_id))
+
+            loaded_version, entries = self._load(subject_id)
+
+            with self._lock:
+                pool = self._pools.get(subject_id)
+                if _current(pool, db_version) and pool.db_version >= loaded_version:
+                    return pool
+                if (self._generation, self.version(subject_id)) == seen:
+                    pool = SubjectPool(subject_id, entries, loaded_version)
+                    self._pools[subject_id] = pool
+                    return pool
+
+    def peek(self, subject_id):
+        """Return the pool only if it is already warm (never hits the DB)"""
+        return self._pools.get(subject_id)
+
+    def invalidate(self, subject_id=None):
+        with self._lock:
+            if subject_id is None:
+                self._pools.clear()
+                self._generation += 1
+                for key in list(self._versions):
+                    self._versions[key] += 1
+            else:
+                self._pools.pop(subject_id, None)
+                self.bump_version(subject_id)
+
+    def version(self, subject_id):
+        return self._versions.get(subject_id, 0)
+
+    def bump_version(self, subject_id):
+        with self._lock:
+            self._versions[subject_id] = self._versions.get(subject_id, 0) + 1
+
+    @staticmethod
+    def _load(subject_id):
+        """
+        (db_version, entries) for a subject. Narrow projection of the
+        selection columns only: text, options and answers stay in the DB
+        until the chosen ids are loaded.
+
+        Runs on its own connection rather than the request session, whose
+        open transaction may be reading a snapshot older than the version
+        get() compared against. Counter and rows are read in one
+        transaction, so they describe the same state of the bank.
+        """
+        query = db.select(
+            Question.id,
+            Question.blooms_level,
+            Question.difficulty,
+            Question.question_type,
+            Question.marks,
+            db.func.coalesce(Question.times_used, 0)
+        ).where(Question.subject_id == subject_id)
+        version_query = db.select(TableVersion.version)\
+            .where(TableVersion.name == table_versions.subject_key(subject_id))
+        with db.engine.connect() as conn, conn.begin():
+            db_version = conn.execute(version_query).scalar() or 0
+            return db_version, [PoolEntry._make(row) for row in conn.execute(query)]
+
+
+def _current(pool, db_version):
+    """pool exists and is not behind the DB counter (None = don't check)"""
+    return pool is not None and (db_version is None or pool.db_version >= db_version)
+
+
+def _registry():
+    registry = current_app.extensions.get('question_pool')
+    if registry is None:
+        registry = current_app.extensions.setdefault('question_pool', PoolRegistry())
+    return registry
+
+
+def get_pool(subject_id, db_version=None):
+    """
+    Warm pool for a subject, built from the DB on first use and rebuilt
+    when it is behind db_version (the subject's table_versions counter).
+    """
+    return _registry().get(subject_id, db_version)
+
+
+def bank_version(subject_id):
+    """Counter that changes whenever a question in the subject is written"""
+    return _registry().version(subject_id)
+
+
+# Write hooks: call after commit with the subject's counter as bumped by
+# that commit (table_versions.bump returns it).
+
+def question_saved(question, db_version=None):
+    """Keep a warm pool in sync after a question is created or updated"""
+    registry = _registry()
+    registry.bump_version(question.subject_id)
+    pool = registry.peek(question.subject_id)
+    if pool is not None:
+        pool.upsert(_entry_from_question(question), db_version)
+
+
+def question_deleted(subject_id, question_id, db_version=None):
+    registry = _registry()
+    registry.bump_version(subject_id)
+    pool = registry.peek(subject_id)
+    if pool is not None:
+        pool.discard(question_id, db_version)
+
+
+def questions_used(subject_id, question_ids, db_version=None):
+    registry = _registry()
+    registry.bump_version(subject_id)
+    pool = registry.peek(subject_id)
+    if pool is not None:
+        pool.record_usage(question_ids, db_version)
+
+
+def invalidate(subject_id=None):
+    _registry().invalidate(subject_id)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from sqlalchemy.dialects.sqlite import insert
+from app.extensions import db
+from app.models.table_version import TableVersion
+
+
+def subject_key(subject_id):
+    """Counter for one subject's questions (question writes and saved papers)"""
+    return f'questions:{subject_id}'
+
+
+def question_keys(subject_id):
+    """Version names touched by a write to one subject's questions"""
+    return ['questions', subject_key(subject_id)]
+
+
+def bump(*names):
+    """
+    Increment the named counters inside the current transaction
+    (call before db.session.commit()). Returns {name: new version}.
+    """
+    now = datetime.utcnow()
+    versions = {}
+    for name in dict.fromkeys(names):
+        stmt = insert(TableVersion).values(name=name, version=1, updated_at=now)
+        versions[name] = db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={'version': TableVersion.version + 1, 'updated_at': now}
+        ).returning(TableVersion.version)).scalar_one()
+    return versions
+
+
+def get_many(names):
+    """{name: (version, updated_at)}; names never written report (0, None)"""
+    rows = db.session.query(TableVersion.name, TableVersion.version, TableVersion.updated_at)\
+        .filter(TableVersion.name.in_(names)).all()
+    found = {name: (version, updated_at) for name, version, updated_at in rows}
+    return {name: found.get(name, (0, None)) for name in names}
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from flask import current_app, jsonify
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jti
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+
+
+def issue_tokens(user_id):
+    """
+    New access + refresh token pair for a user. The refresh token is
+    recorded server-side; the caller commits.
+    """
+    refresh_token = create_refresh_token(identity=str(user_id))
+    return _record(user_id, refresh_token), get_jti(refresh_token)
+
+
+def rotate(jti, user_id):
+    """
+    Exchange a (still valid) refresh token for a new pair: the old jti is
+    revoked and linked to its replacement. The revoke only matches a row
+    that is still active, so when two requests race with the same token
+    only one gets a pair; the other gets None. The caller commits.
+    """
+    refresh_token = create_refresh_token(identity=str(user_id))
+    revoked = db.session.query(RefreshToken).filter(
+        RefreshToken.jti == jti, RefreshToken.revoked_at.is_(None)
+    ).update({'revoked_at': datetime.utcnow(), 'replaced_by': get_jti(refresh_token)},
+             synchronize_session=False)
+    if not revoked:
+        return None
+    return _record(user_id, refresh_token)
+
+
+def _record(user_id, refresh_token):
+    now = datetime.utcnow()
+    _purge_expired(user_id, now)
+    db.session.add(RefreshToken(
+        jti=get_jti(refresh_token),
+        user_id=int(user_id),
+        created_at=now,
+        expires_at=now + current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+    ))
+    return {
+        'access_token': create_access_token(identity=str(user_id)),
+        'refresh_token': refresh_token
+    }
+
+
+def revoke(jti):
+    db.session.query(RefreshToken).filter(
+        RefreshToken.jti == jti, RefreshToken.revoked_at.is_(None)
+    ).update({'revoked_at': datetime.utcnow()}, synchronize_session=False)
+
+
+def revoke_all(user_id):
+    """Sign a user out everywhere: revoke every refresh token they still hold"""
+    db.session.query(RefreshToken).filter(
+        RefreshToken.user_id == int(user_id), RefreshToken.revoked_at.is_(None)
+    ).update({'revoked_at': datetime.utcnow()}, synchronize_session=False)
+
+
+def _purge_expired(user_id, now):
+    db.session.query(RefreshToken).filter(
+        RefreshToken.user_id == int(user_id), RefreshToken.expires_at <= now
+    ).delete(synchronize_session=False)
+
+
+def init_app(jwt):
+    """Register the revocation callbacks on the JWTManager"""
+
+    @jwt.token_in_blocklist_loader
+    def token_is_revoked(jwt_header, jwt_payload):
+        # Access tokens are short-lived and never looked up; only refresh
+        # tokens need a row to be accepted.
+        if jwt_payload.get('type') != 'refresh':
+            return False
+        row = db.session.get(RefreshToken, jwt_payload['jti'])
+        return row is None or not row.is_active
+
+    @jwt.revoked_token_loader
+    def revoked_token_response(jwt_header, jwt_payload):
+        # A rotated refresh token presented again means it leaked (or two
+        # clients raced). Outside the grace window, end the whole session.
+        if jwt_payload.get('type') == 'refresh':
+            row = db.session.get(RefreshToken, jwt_payload['jti'])
+            grace = timedelta(seconds=current_app.config.get('JWT_REFRESH_REUSE_GRACE', 30))
+            if row is not None and row.replaced_by and datetime.utcnow() - row.revoked_at > grace:
+                revoke_all(row.user_id)
+                db.session.commit()
+        return jsonify({'msg': 'Token has been revoked'}), 401
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import current_app, has_app_context, jsonify
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 60
+
+_FIELDS = ['id', 'username', 'email', 'role', 'created_at', 'is_active']
+
+
+class CachedUser(namedtuple('CachedUser', _FIELDS)):
+    """
+    Read-only snapshot of a users row. This is what current_user is on
+    authenticated requests. It holds no session state, so it can be
+    shared across requests and threads.
+    """
+    __slots__ = ()
+
+    # Same public representation as the model
+    to_dict = User.to_dict
+
+
+class UserCache:
+    """
+    LRU of CachedUser by id with a TTL. Entries expire after ttl seconds
+    even if nothing invalidates them, so edits made by another worker
+    process show up within that window. Writes through the ORM in this
+    process invalidate immediately (see _register_invalidation).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id -> (expires_at, CachedUser)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None and cached[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        user = self._load(user_id)
+        if user is not None and self.max_entries > 0:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    @staticmethod
+    def _load(user_id):
+        row = db.session.query(*(getattr(User, f) for f in _FIELDS)).filter(User.id == user_id).first()
+        return CachedUser._make(row) if row is not None else None
+
+
+def get_user_cache():
+    cache = current_app.extensions.get('user_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('user_cache', UserCache(
+            max_entries=current_app.config.get('USER_CACHE_SIZE', DEFAULT_MAX_ENTRIES),
+            ttl=current_app.config.get('USER_CACHE_TTL', DEFAULT_TTL_SECONDS)
+        ))
+    return cache
+
+
+def get_user(user_id):
+    """CachedUser for an id, or None if the user no longer exists"""
+    return get_user_cache().get(int(user_id))
+
+
+def invalidate(user_id=None):
+    get_user_cache().invalidate(user_id)
+
+
+def _invalidate_row(mapper, connection, target):
+    if has_app_context():
+        invalidate(target.id)
+
+
+def _register_invalidation():
+    # ORM updates/deletes of a User evict it. Bulk query.update() /
+    # delete() bypass these events and must call invalidate() themselves.
+    if not event.contains(User, 'after_update', _invalidate_row):
+        event.listen(User, 'after_update', _invalidate_row)
+        event.listen(User, 'after_delete', _invalidate_row)
+
+
+def init_app(jwt):
+    """Resolve current_user through the cache on every authenticated request"""
+    _register_invalidation()
+
+    @jwt.user_lookup_loader
+    def load_user(jwt_header, jwt_payload):
+        return get_user(jwt_payload['sub'])
+
+    @jwt.user_lookup_error_loader
+    def user_not_found(jwt_header, jwt_payload):
+        return jsonify({'error': 'User not found'}), 401
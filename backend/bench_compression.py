@@ -0,0 +1,51 @@
+"""
+Benchmark: bytes on the wire and CPU cost of response compression for the
+largest API payloads (question list, paper detail, CSV export) at the
+configured levels.
+
+Run from the backend/ directory:
+    python bench_compression.py [--questions 5000] [--paper-questions 200] [--repeat 20]
+"""
+
+import argparse
+
+from app import create_app
+from app.compression import available_encodings, compress
+from bench_json import seed, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--questions', type=int, default=5000)
+    parser.add_argument('--paper-questions', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False
+    app.config['COMPRESS_ENABLED'] = False  # measure raw bodies, compress below
+    paper_id, token = seed(app, args.questions, args.paper_questions)
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    endpoints = [
+        ('/api/questions/', 'GET questions'),
+        (f'/api/papers/{paper_id}', 'GET paper'),
+        ('/api/questions/export?format=csv', 'export csv'),
+    ]
+    levels = {
+        'gzip': {'gzip_level': app.config['COMPRESS_LEVEL']},
+        'br': {'brotli_quality': app.config['COMPRESS_BR_QUALITY']},
+    }
+    for url, label in endpoints:
+        body = client.get(url, headers=headers).get_data()
+        results = [f'{len(body):>10,}B raw']
+        for encoding in available_encodings():
+            size = len(compress(body, encoding, **levels[encoding]))
+            ms = timed(lambda: compress(body, encoding, **levels[encoding]), args.repeat)
+            results.append(f'{encoding} {size:>9,}B ({100 * size / len(body):4.1f}%) {ms:6.1f} ms')
+        print(f'{label:14s} ' + ' | '.join(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: JSON serialization of the largest API responses with Flask's
+default provider vs FastJSONProvider (orjson).
+
+Seeds an in-memory database, then times GET /api/questions/ and
+GET /api/papers/<id> end to end, plus the encoding step on its own.
+
+Run from the backend/ directory:
+    python bench_json.py [--questions 5000] [--paper-questions 200] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.json_provider import FastJSONProvider, orjson
+from app.models.paper import Paper, paper_questions
+from app.models.question import Question
+from app.models.user import User
+
+
+def seed(app, n_questions, n_paper_questions):
+    with app.app_context():
+        user = User.query.first()
+        rows = [{
+            'text': f'Explain the significance of concept number {i} in detail with examples.',
+            'question_type': 'mcq' if i % 3 == 0 else 'long',
+            'blooms_level': Question.BLOOMS_LEVELS[i % 6],
+            'difficulty': Question.DIFFICULTY_LEVELS[i % 3],
+            'marks': 1 if i % 3 == 0 else 5,
+            'option_a': 'Option A', 'option_b': 'Option B', 'option_c': 'Option C', 'option_d': 'Option D',
+            'correct_answer': 'Option A',
+            'subject_id': 1, 'created_by': user.id, 'times_used': 0,
+        } for i in range(n_questions)]
+        db.session.execute(Question.__table__.insert(), rows)
+
+        paper = Paper(title='Bench', total_marks=100, duration_minutes=60, config={},
+                      subject_id=1, created_by=user.id)
+        db.session.add(paper)
+        db.session.flush()
+        db.session.execute(paper_questions.insert(), [
+            {'paper_id': paper.id, 'question_id': qid, 'order': i}
+            for i, qid in enumerate(range(1, n_paper_questions + 1))
+        ])
+        db.session.commit()
+        return paper.id, create_access_token(identity=str(user.id))
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--questions', type=int, default=5000)
+    parser.add_argument('--paper-questions', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print('orjson is not installed; FastJSONProvider falls back to the default encoder')
+
+    app = create_app('testing')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False
+    paper_id, token = seed(app, args.questions, args.paper_questions)
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with app.app_context():
+        payload = {'questions': [q.to_dict() for q in Question.query.all()]}
+
+    endpoints = [('/api/questions/', 'GET questions'), (f'/api/papers/{paper_id}', 'GET paper')]
+    for name, provider in (('default', DefaultJSONProvider(app)), ('fast', FastJSONProvider(app))):
+        app.json = provider
+        encode_ms = timed(lambda: provider.dumps(payload), args.repeat)
+        results = [f'encode {len(payload["questions"])} questions {encode_ms:7.1f} ms']
+        for url, label in endpoints:
+            ms = timed(lambda: client.get(url, headers=headers), args.repeat)
+            results.append(f'{label} {ms:7.1f} ms')
+        print(f'{name:8s} ' + ' | '.join(results))
+
+
+if __name__ == '__main__':
+    main()
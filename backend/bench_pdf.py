@@ -0,0 +1,75 @@
+"""
+Benchmark: per-paper PDF render time with the shared PaperTemplate.
+
+  cold    - fresh template every run (styles built, every question laid out),
+            i.e. what every render cost before templates were shared
+  warm    - the same paper rendered again (all questions memoized)
+  shuffle - another paper with the same questions in a different order
+            (numbering changes, layouts are still reused)
+
+Run from the backend/ directory:
+    python bench_pdf.py [--sizes 50 200] [--repeat 10]
+"""
+
+import argparse
+import random
+import time
+
+from app.services import pdf_templates
+from app.services.pdf_generator import generate_paper_pdf
+
+
+def make_paper(n_questions):
+    questions = [{
+        'id': i,
+        'text': f'Explain the significance of concept number {i} in detail, with <b>examples</b> '
+                f'and diagrams where relevant. Compare it with at least two related concepts.',
+        'question_type': 'mcq' if i % 3 == 0 else 'long',
+        'marks': 1 if i % 3 == 0 else 5,
+        'options': {'a': 'First option', 'b': 'Second option', 'c': 'Third option', 'd': 'Fourth option'},
+    } for i in range(1, n_questions + 1)]
+    return {
+        'title': f'Benchmark Paper ({n_questions} questions)',
+        'total_marks': sum(q['marks'] for q in questions),
+        'duration_minutes': 180,
+        'subject_name': 'Computer Science',
+        'date': '01 January 2026',
+        'questions': questions,
+    }
+
+
+def timed(fn, repeat, before=None):
+    total = 0.0
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        total += time.perf_counter() - start
+    return total / repeat * 1000
+
+
+def fresh_template():
+    pdf_templates._template = pdf_templates.PaperTemplate()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        paper = make_paper(size)
+        shuffled = dict(paper, questions=random.sample(paper['questions'], size))
+
+        cold = timed(lambda: generate_paper_pdf(paper), args.repeat, before=fresh_template)
+        generate_paper_pdf(paper)
+        warm = timed(lambda: generate_paper_pdf(paper), args.repeat)
+        shuffle = timed(lambda: generate_paper_pdf(shuffled), args.repeat)
+        print(f'{size:4d} questions | cold {cold:7.1f} ms | warm {warm:7.1f} ms ({cold / warm:4.1f}x) '
+              f'| shuffle {shuffle:7.1f} ms ({cold / shuffle:4.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: SQLite read/write throughput with default settings vs the tuned
+profile from app.config (WAL, busy_timeout, mmap, cache, synchronous=NORMAL).
+
+Runs concurrent reader and writer threads against a throwaway database file
+for each profile and prints operations per second and lock errors.
+
+Run from the backend/ directory:
+    python bench_sqlite.py [--seconds 5] [--readers 8] [--writers 2]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from app.config import _tuned_sqlite_pragmas
+
+SCHEMA = """
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    blooms_level VARCHAR(20) NOT NULL,
+    difficulty VARCHAR(10) NOT NULL,
+    marks INTEGER NOT NULL,
+    subject_id INTEGER NOT NULL,
+    times_used INTEGER DEFAULT 0
+);
+CREATE INDEX ix_questions_subject ON questions (subject_id, blooms_level, times_used);
+"""
+BLOOMS = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
+
+
+def connect(path, pragmas):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name}={value}')
+    return conn
+
+
+def prepare(path, pragmas, rows=20000):
+    conn = connect(path, pragmas)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        'INSERT INTO questions (text, blooms_level, difficulty, marks, subject_id) VALUES (?,?,?,?,?)',
+        [(f'Question {i}', BLOOMS[i % 6], 'medium', 1 + i % 10, 1 + i % 5) for i in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(path, pragmas, seconds, readers, writers):
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def reader(n):
+        conn = connect(path, pragmas)
+        done = 0
+        while time.monotonic() < stop:
+            conn.execute(
+                'SELECT id, marks FROM questions WHERE subject_id=? AND blooms_level=? '
+                'ORDER BY times_used LIMIT 50', (1 + n % 5, BLOOMS[n % 6])
+            ).fetchall()
+            done += 1
+        with lock:
+            counts['reads'] += done
+        conn.close()
+
+    def writer(n):
+        conn = connect(path, pragmas)
+        done = locked = 0
+        while time.monotonic() < stop:
+            try:
+                conn.execute('UPDATE questions SET times_used = times_used + 1 WHERE id IN (?,?,?)',
+                             (n * 3 + 1, n * 3 + 2, n * 3 + 3))
+                conn.execute('INSERT INTO questions (text, blooms_level, difficulty, marks, subject_id) '
+                             'VALUES (?,?,?,?,?)', ('bench', 'apply', 'easy', 2, 1))
+                conn.commit()
+                done += 1
+            except sqlite3.OperationalError:
+                conn.rollback()
+                locked += 1
+        with lock:
+            counts['writes'] += done
+            counts['locked'] += locked
+        conn.close()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+
+    profiles = [('default', {}), ('tuned', _tuned_sqlite_pragmas())]
+    for name, pragmas in profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.db')
+            prepare(path, pragmas)
+            counts = run(path, pragmas, args.seconds, args.readers, args.writers)
+        print(f"{name:8s} reads/s={counts['reads'] / args.seconds:10.0f} "
+              f"writes/s={counts['writes'] / args.seconds:8.0f} "
+              f"locked={counts['locked']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""add selection and lookup indexes
+
+Revision ID: 4c2e8a91d7b3
+Revises: 17b15564c30e
+Create Date: 2026-10-18 10:12:41.508113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c2e8a91d7b3'
+down_revision = '17b15564c30e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_questions_subject_selection', 'questions',
+                    ['subject_id', 'blooms_level', 'difficulty', 'question_type', 'marks', 'times_used'],
+                    unique=False)
+    op.create_index('ix_questions_blooms_difficulty', 'questions',
+                    ['blooms_level', 'difficulty'], unique=False)
+    op.create_index('ix_paper_questions_question_id', 'paper_questions',
+                    ['question_id'], unique=False)
+    op.create_index('ix_papers_created_by', 'papers', ['created_by'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_papers_created_by', table_name='papers')
+    op.drop_index('ix_paper_questions_question_id', table_name='paper_questions')
+    op.drop_index('ix_questions_blooms_difficulty', table_name='questions')
+    op.drop_index('ix_questions_subject_selection', table_name='questions')
@@ -0,0 +1,29 @@
+"""add table_versions
+
+Revision ID: 9d1f3b6a2c47
+Revises: 4c2e8a91d7b3
+Create Date: 2026-10-18 14:03:27.193552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1f3b6a2c47'
+down_revision = '4c2e8a91d7b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_versions',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,24 @@
+"""add (subject_id, id) index for keyset pagination
+
+Revision ID: e5d2b8c4f7a1
+Revises: b7e4c1d9a5f2
+Create Date: 2026-10-18 19:40:52.117604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5d2b8c4f7a1'
+down_revision = 'b7e4c1d9a5f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_questions_subject_id_id', 'questions', ['subject_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_questions_subject_id_id', table_name='questions')
@@ -0,0 +1,57 @@
+"""
+Write .gz (and .br, when the brotli package is installed) siblings next to
+every frontend asset so the app can serve them without compressing per
+request (see send_precompressed in app/compression.py).
+
+Re-run after editing the frontend; stale siblings (older than their source)
+are ignored by the server anyway.
+
+Run from the backend/ directory:
+    python precompress_frontend.py [--dir ../frontend] [--min-size 1024]
+"""
+
+import argparse
+import gzip
+import os
+
+from app.compression import STATIC_SUFFIXES, brotli
+
+EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.txt')
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend')
+
+
+def precompress(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    outputs = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        outputs['br'] = brotli.compress(data, quality=11)
+
+    for encoding, payload in outputs.items():
+        with open(path + STATIC_SUFFIXES[encoding], 'wb') as f:
+            f.write(payload)
+    return len(data), {e: len(p) for e, p in outputs.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=DEFAULT_DIR)
+    parser.add_argument('--min-size', type=int, default=1024)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli not installed - writing .gz files only")
+
+    for root, _, files in os.walk(args.dir):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if not name.endswith(EXTENSIONS) or os.path.getsize(path) < args.min_size:
+                continue
+            original, sizes = precompress(path)
+            summary = ', '.join(f"{e} {s:,}B ({100 * s / original:.0f}%)" for e, s in sizes.items())
+            print(f"{os.path.relpath(path, args.dir):<24} {original:>8,}B -> {summary}")
+
+
+if __name__ == '__main__':
+    main()
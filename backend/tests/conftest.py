@@ -0,0 +1,96 @@
+import random
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.question import Question
+from app.models.user import User
+
+
+SUBJECT_ID = 1
+QUESTION_COUNT = 600
+PAPER_CONFIG = {
+    'blooms_distribution': {'remember': 20, 'understand': 30, 'apply': 50},
+    'difficulty_distribution': {'easy': 30, 'medium': 50, 'hard': 20},
+    'question_type': 'mixed'
+}
+
+
+def paper_body(**extra):
+    """JSON body for POST /api/papers/generate (and /generate-set with extra fields)"""
+    return dict({'title': 'Test Paper', 'subject_id': SUBJECT_ID, 'total_marks': 50,
+                 'duration_minutes': 60, 'config': PAPER_CONFIG}, **extra)
+
+
+@contextmanager
+def capture_statements(selects_only=False):
+    """Collect (statement, parameters) for every SQL statement run inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not selects_only or statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def seed_questions(count=QUESTION_COUNT, subject_id=SUBJECT_ID, seed=1):
+    """Mixed bank: mcq = 1 mark, short = 2/3/5, long = 10, times_used 0-3"""
+    rng = random.Random(seed)
+    for i in range(count):
+        qtype = rng.choice(['mcq', 'short', 'long'])
+        db.session.add(Question(
+            text=f'Q{i}',
+            question_type=qtype,
+            blooms_level=rng.choice(Question.BLOOMS_LEVELS),
+            difficulty=rng.choice(Question.DIFFICULTY_LEVELS),
+            marks={'mcq': 1, 'short': rng.choice([2, 3, 5]), 'long': 10}[qtype],
+            option_a='a' if qtype == 'mcq' else None,
+            subject_id=subject_id,
+            created_by=1,
+            times_used=rng.randint(0, 3)
+        ))
+    db.session.commit()
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app('testing')
+    app.config.update(
+        JWT_ACCESS_TOKEN_EXPIRES=False,
+        PDF_CACHE_DIR=str(tmp_path / 'pdf-cache'),
+        PDF_PRERENDER=False,
+        PDF_RENDER_PROCESSES=0
+    )
+    with app.app_context():
+        user = User(username='tester', email='tester@example.com')
+        user.set_password('pw')
+        db.session.add(user)
+        db.session.commit()
+        seed_questions()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    response = client.post('/api/auth/login', json={'email': 'tester@example.com', 'password': 'pw'})
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def paper_id(client, auth_headers):
+    """Id of a freshly generated paper_body() paper"""
+    response = client.post('/api/papers/generate', headers=auth_headers, json=paper_body())
+    assert response.status_code == 201
+    return response.get_json()['paper']['id']
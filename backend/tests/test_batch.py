@@ -0,0 +1,41 @@
+import gzip
+import json
+
+
+def _batch(client, auth_headers, *paths, **headers):
+    response = client.post('/api/batch', headers=dict(auth_headers, **headers),
+                           json={'requests': [{'id': str(i), 'path': p} for i, p in enumerate(paths)]})
+    assert response.status_code == 200
+    body = response.data
+    if response.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json.loads(body)['responses']
+
+
+def test_json_entries_in_order(client, auth_headers, paper_id):
+    subjects, missing, paper = _batch(client, auth_headers, '/api/subjects/', '/api/papers/999999',
+                                      f'/api/papers/{paper_id}')
+    assert subjects['status'] == 200 and subjects['id'] == '0'
+    assert missing['status'] == 404
+    assert 'Not Found' in missing['body']
+    assert paper['status'] == 200 and paper['body']['paper']['id'] == paper_id
+
+
+def test_file_response_is_a_per_entry_error(client, auth_headers, paper_id):
+    pdf, subjects = _batch(client, auth_headers, f'/api/papers/{paper_id}/pdf', '/api/subjects/')
+    assert pdf['status'] == 406
+    assert 'error' in pdf['body']
+    assert subjects['status'] == 200
+
+
+def test_text_response_is_embedded(client, auth_headers, paper_id):
+    (html,) = _batch(client, auth_headers, f'/api/papers/{paper_id}/render')
+    assert html['status'] == 200
+    assert html['body'].lstrip().lower().startswith('<!doctype html>')
+
+
+def test_sub_responses_are_not_compressed(client, auth_headers):
+    # The batch reply is compressed once as a whole; entries stay plain JSON
+    (questions,) = _batch(client, auth_headers, '/api/questions/?subject_id=1', **{'Accept-Encoding': 'gzip'})
+    assert questions['status'] == 200
+    assert len(questions['body']['questions']) == 600
@@ -0,0 +1,120 @@
+import gzip
+import importlib
+import io
+import os
+import pytest
+from flask import Response, jsonify, send_file
+from app import compression
+
+
+@pytest.fixture
+def compress_client(app):
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+
+    @app.route('/_test/json/<int:size>')
+    def json_of_size(size):
+        return jsonify({'data': 'x' * size})
+
+    @app.route('/_test/stream')
+    def streamed():
+        return Response((('line %d\n' % i) * 200 for i in range(5)), mimetype='text/plain')
+
+    @app.route('/_test/file')
+    def passthrough():
+        return send_file(io.BytesIO(b'a' * 5000), mimetype='text/plain')
+
+    @app.route('/_test/error')
+    def error():
+        return jsonify({'error': 'x' * 5000}), 400
+
+    return app.test_client()
+
+
+def test_compresses_json_above_threshold(compress_client):
+    response = compress_client.get('/_test/json/5000', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'x' * 5000 in gzip.decompress(response.data)
+
+
+def test_leaves_small_responses_alone(compress_client):
+    response = compress_client.get('/_test/json/10', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.get_json() == {'data': 'x' * 10}
+
+
+def test_honours_q_values(compress_client):
+    refused = compress_client.get('/_test/json/5000', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in refused.headers
+
+    preferred = compress_client.get('/_test/json/5000', headers={'Accept-Encoding': 'identity;q=0.5, gzip;q=0.9'})
+    assert preferred.headers['Content-Encoding'] == 'gzip'
+
+
+def test_negotiate_prefers_highest_q(app):
+    with app.test_request_context(headers={'Accept-Encoding': 'br;q=0.2, gzip;q=0.8'}):
+        assert compression.negotiate_encoding(['br', 'gzip']) == 'gzip'
+    with app.test_request_context(headers={'Accept-Encoding': 'br, gzip;q=0.8'}):
+        assert compression.negotiate_encoding(['br', 'gzip']) == 'br'
+
+
+def test_skips_streamed_and_passthrough_responses(compress_client):
+    streamed = compress_client.get('/_test/stream', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in streamed.headers
+    assert streamed.data.startswith(b'line 0')
+
+    passthrough = compress_client.get('/_test/file', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in passthrough.headers
+    assert passthrough.data == b'a' * 5000
+
+
+def test_skips_errors_and_disabled(app, compress_client):
+    response = compress_client.get('/_test/error', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+    app.config['COMPRESS_ENABLED'] = False
+    response = compress_client.get('/_test/json/5000', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    (tmp_path / 'page.html').write_text('<html>' + 'p' * 4000 + '</html>')
+    (tmp_path / 'page.html.gz').write_bytes(gzip.compress(b'gz sibling'))
+    (tmp_path / 'page.html.br').write_bytes(b'br sibling')
+    monkeypatch.setattr(importlib.import_module('app'), 'FRONTEND_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_serves_fresh_gzip_sibling(client, static_dir):
+    response = client.get('/page.html', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/html'
+    assert gzip.decompress(response.data) == b'gz sibling'
+    response.close()
+
+
+def test_serves_br_sibling_when_preferred(app, static_dir):
+    with app.test_request_context(headers={'Accept-Encoding': 'br, gzip;q=0.5'}):
+        response = compression.send_precompressed(str(static_dir), 'page.html')
+        response.direct_passthrough = False
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.get_data() == b'br sibling'
+        response.close()
+
+
+def test_ignores_stale_siblings_and_identity_clients(client, static_dir):
+    plain = client.get('/page.html', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.data.startswith(b'<html>')
+    plain.close()
+
+    source = static_dir / 'page.html'
+    older = os.path.getmtime(source) - 60
+    for suffix in ('.gz', '.br'):
+        os.utime(str(source) + suffix, (older, older))
+    stale = client.get('/page.html', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in stale.headers
+    assert stale.data.startswith(b'<html>')
+    stale.close()
@@ -0,0 +1,110 @@
+import pytest
+from app.services import exact_solver
+from app.services.exact_solver import solve_exact, _cell_options, _decompose
+from app.services.question_pool import PoolEntry, SubjectPool
+from tests.conftest import PAPER_CONFIG, paper_body
+
+
+def _pool(spec):
+    """spec: [(blooms_level, difficulty, marks, count)]"""
+    entries = []
+    for blooms_level, difficulty, marks, count in spec:
+        for _ in range(count):
+            qtype = 'mcq' if marks == 1 else 'short'
+            entries.append(PoolEntry(len(entries) + 1, blooms_level, difficulty, qtype, marks, 0))
+    return SubjectPool(1, entries)
+
+
+CONFIG = {
+    'blooms_distribution': {'remember': 50, 'apply': 50},
+    'difficulty_distribution': {'easy': 100},
+    'question_type': 'mixed',
+    'solver': 'exact'
+}
+
+
+def test_cell_options_prefer_fewest_ones():
+    options = _cell_options({1: 3, 5: 2}, 12, None)
+    assert options[10] == 0
+    assert options[11] == 1
+    assert options[12] == 2
+    assert 4 not in options
+
+
+def test_cell_options_respect_mcq_cap():
+    assert 3 not in _cell_options({1: 5}, 10, 2)
+
+
+def test_decompose_matches_total():
+    counts = _decompose({1: 4, 3: 2, 5: 1}, 12, 1)
+    assert counts[1] == 1
+    assert sum(marks * n for marks, n in counts.items()) == 12
+    assert all(n <= {1: 4, 3: 2, 5: 1}[marks] for marks, n in counts.items())
+
+
+def test_hits_exact_total_greedy_would_miss():
+    # Only odd 5s and a 3: 13 = 5 + 5 + 3, split across the two cells
+    pool = _pool([('remember', 'easy', 5, 2), ('apply', 'easy', 3, 1), ('apply', 'easy', 10, 1)])
+    selected = solve_exact(pool, 13, CONFIG)
+    assert sum(q.marks for q in selected) == 13
+    assert len({q.id for q in selected}) == len(selected)
+
+
+def test_minimises_deviation_from_targets():
+    pool = _pool([('remember', 'easy', 5, 4), ('apply', 'easy', 5, 4)])
+    selected = solve_exact(pool, 20, CONFIG)
+    by_bloom = {}
+    for q in selected:
+        by_bloom[q.blooms_level] = by_bloom.get(q.blooms_level, 0) + q.marks
+    assert by_bloom == {'remember': 10, 'apply': 10}
+
+
+def test_never_exceeds_mcq_cap():
+    pool = _pool([('remember', 'easy', 1, 20), ('apply', 'easy', 1, 20), ('apply', 'easy', 5, 1)])
+    selected = solve_exact(pool, 20, dict(CONFIG, max_mcqs=6))
+    assert sum(1 for q in selected if q.marks == 1) <= 6
+    assert sum(q.marks for q in selected) == 11
+
+
+def test_budget_out_before_dp_returns_none():
+    pool = _pool([('remember', 'easy', 5, 2)])
+    assert solve_exact(pool, 10, dict(CONFIG, time_budget_ms=1e-9)) is None
+
+
+def test_budget_out_mid_dp_keeps_finished_cells(monkeypatch):
+    pool = _pool([('apply', 'easy', 5, 2), ('remember', 'easy', 5, 2)])
+    real_check = exact_solver._check
+    calls = []
+
+    def check(deadline):
+        calls.append(deadline)
+        # 2 option passes + 1 state in the first DP layer, then time is up
+        if len(calls) > 3:
+            raise exact_solver.BudgetExceeded()
+        real_check(deadline)
+
+    monkeypatch.setattr(exact_solver, '_check', check)
+    selected = solve_exact(pool, 20, CONFIG)
+    # Only the 'apply' cell (first in sorted order) made it into the answer
+    assert selected and {q.blooms_level for q in selected} == {'apply'}
+    assert sum(q.marks for q in selected) == 10
+
+
+def test_null_budget_uses_default():
+    pool = _pool([('remember', 'easy', 5, 2)])
+    assert sum(q.marks for q in solve_exact(pool, 10, dict(CONFIG, time_budget_ms=None))) == 10
+
+
+@pytest.mark.parametrize('budget', ['fast', True, 0, -5, [1]])
+def test_generate_rejects_bad_time_budget(client, auth_headers, budget):
+    config = dict(PAPER_CONFIG, solver='exact', time_budget_ms=budget)
+    response = client.post('/api/papers/generate', headers=auth_headers, json=paper_body(config=config))
+    assert response.status_code == 400
+    assert 'time_budget_ms' in response.get_json()['error']
+
+
+def test_generate_with_exact_solver(client, auth_headers):
+    config = dict(PAPER_CONFIG, solver='exact', time_budget_ms=2000)
+    response = client.post('/api/papers/generate', headers=auth_headers, json=paper_body(config=config))
+    assert response.status_code == 201
+    assert response.get_json()['paper']['total_marks'] == 50
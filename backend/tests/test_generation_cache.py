@@ -0,0 +1,43 @@
+from app.services.generation_cache import get_cache
+from tests.conftest import PAPER_CONFIG, paper_body
+
+
+EXACT_CONFIG = dict(PAPER_CONFIG, solver='exact', time_budget_ms=5000)
+
+
+def _generate(client, auth_headers, config=PAPER_CONFIG):
+    response = client.post('/api/papers/generate', headers=auth_headers, json=paper_body(config=config))
+    assert response.status_code == 201
+    paper = response.get_json()['paper']
+    assert paper['total_marks'] == 50
+    return {q['id'] for q in paper['questions']}
+
+
+def test_repeated_exact_generate_hits_and_rotates(client, auth_headers):
+    cache = get_cache()
+    first = _generate(client, auth_headers, EXACT_CONFIG)
+    second = _generate(client, auth_headers, EXACT_CONFIG)
+    third = _generate(client, auth_headers, EXACT_CONFIG)
+    # Saving each paper bumps times_used, but the bucket sizes are unchanged
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert first != second and second != third
+
+
+def test_greedy_generate_skips_cache(client, auth_headers):
+    cache = get_cache()
+    _generate(client, auth_headers)
+    _generate(client, auth_headers)
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_question_writes_change_the_key(client, auth_headers):
+    cache = get_cache()
+    _generate(client, auth_headers, EXACT_CONFIG)
+
+    question = client.get('/api/questions/?subject_id=1', headers=auth_headers).get_json()['questions'][0]
+    assert client.delete(f"/api/questions/{question['id']}", headers=auth_headers).status_code == 200
+    _generate(client, auth_headers, EXACT_CONFIG)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    _generate(client, auth_headers, EXACT_CONFIG)
+    assert (cache.hits, cache.misses) == (1, 2)
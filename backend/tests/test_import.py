@@ -0,0 +1,76 @@
+import io
+import json
+from app.routes import questions as questions_routes
+from app.services import question_pool
+
+CSV_HEADER = 'text,question_type,blooms_level,difficulty,marks\n'
+
+
+def _csv_row(i):
+    return f'Imported {i},short,apply,easy,3\n'
+
+
+def _jsonl_row(i):
+    return json.dumps({'text': f'Imported {i}', 'question_type': 'short', 'blooms_level': 'apply',
+                       'difficulty': 'easy', 'marks': 3}) + '\n'
+
+
+def _import(client, auth_headers, body, filename):
+    data = {'file': (io.BytesIO(body), filename)}
+    return client.post('/api/questions/import?subject_id=1', headers=auth_headers, data=data,
+                       content_type='multipart/form-data')
+
+
+def test_import_csv_and_jsonl(client, auth_headers):
+    body = (CSV_HEADER + _csv_row(1) + 'Bad,short,apply,easy,zero\n' + _csv_row(2)).encode('utf-8-sig')
+    response = _import(client, auth_headers, body, 'bank.csv')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result['imported'], result['failed']) == (2, 1)
+    assert result['errors'] == [{'line': 3, 'error': 'marks and subject_id must be integers'}]
+
+    body = (_jsonl_row(3) + '[1]\n\n' + _jsonl_row(4)).encode('utf-8')
+    result = _import(client, auth_headers, body, 'bank.jsonl').get_json()
+    assert (result['imported'], result['failed']) == (2, 1)
+    assert result['errors'] == [{'line': 2, 'error': 'Each line must be a JSON object'}]
+
+
+def test_import_skips_jsonl_line_that_is_not_utf8(client, auth_headers):
+    body = _jsonl_row(1).encode('utf-8') + b'{"text": "\xff"}\n' + _jsonl_row(2).encode('utf-8')
+    response = _import(client, auth_headers, body, 'bank.jsonl')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result['imported'], result['failed']) == (2, 1)
+    assert result['errors'] == [{'line': 2, 'error': 'Not valid UTF-8'}]
+
+
+def test_import_reports_csv_decode_error_as_json(client, auth_headers):
+    body = (CSV_HEADER + _csv_row(1)).encode('utf-8') + b'\xff\xfe,short,apply,easy,3\n' + _csv_row(2).encode('utf-8')
+    response = _import(client, auth_headers, body, 'bank.csv')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result['imported'], result['failed']) == (1, 1)
+    assert result['errors'][0]['line'] == 3
+    assert 'UTF-8' in result['errors'][0]['error']
+
+    response = _import(client, auth_headers, b'\xff\xfe' + CSV_HEADER.encode('utf-8'), 'bank.csv')
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['line'] == 1
+
+
+def test_import_reports_malformed_csv_as_json(client, auth_headers):
+    body = (CSV_HEADER + 'x' * 200000 + ',short,apply,easy,3\n').encode('utf-8')  # over csv's field limit
+    response = _import(client, auth_headers, body, 'bank.csv')
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['error'].startswith('Invalid CSV')
+
+
+def test_import_refreshes_pool_after_each_chunk(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(questions_routes, 'IMPORT_CHUNK_SIZE', 2)
+    before = len(question_pool.get_pool(1))
+
+    # The second chunk fails to decode after the first one committed
+    body = (CSV_HEADER + _csv_row(1) + _csv_row(2)).encode('utf-8') + b'\xff,short,apply,easy,3\n'
+    result = _import(client, auth_headers, body, 'bank.csv').get_json()
+    assert result['imported'] == 2
+    assert len(question_pool.get_pool(1)) == before + 2
@@ -0,0 +1,53 @@
+import pytest
+from app.extensions import db
+from app.models.question import Question
+from app.services.question_pool import PoolRegistry
+from tests.conftest import capture_statements
+
+
+def _plan(statement, parameters=()):
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+    return ' | '.join(row[-1] for row in rows)
+
+
+def _compiled(query):
+    return str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+
+
+def test_pool_load_is_index_only(app):
+    with capture_statements() as statements:
+        _, entries = PoolRegistry._load(1)
+    assert len(entries) == 600
+
+    (statement, parameters), = [(s, p) for s, p in statements if 'FROM questions' in s]
+    assert 'COVERING INDEX ix_questions_subject_selection' in _plan(statement, parameters)
+
+
+@pytest.mark.parametrize('fields', ['', '&fields=id,text,marks'])
+def test_subject_keyset_page_avoids_temp_btree(client, auth_headers, fields):
+    first = client.get(f'/api/questions/?subject_id=1&limit=50{fields}', headers=auth_headers).get_json()
+    with capture_statements() as statements:
+        response = client.get(f"/api/questions/?subject_id=1&limit=50&cursor={first['next_cursor']}{fields}",
+                              headers=auth_headers)
+    assert response.status_code == 200
+
+    (statement, parameters), = [(s, p) for s, p in statements if 'FROM questions' in s and 'LIMIT' in s]
+    plan = _plan(statement, parameters)
+    assert 'ix_questions_subject_id_id (subject_id=? AND id>?)' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_unscoped_question_filter_uses_blooms_difficulty_index(app):
+    query = db.select(Question.id).where(Question.blooms_level == 'apply', Question.difficulty == 'hard')
+    assert 'ix_questions_blooms_difficulty' in _plan(_compiled(query))
+
+
+def test_paper_question_lookup_uses_question_index(app):
+    assert 'ix_paper_questions_question_id' in _plan('SELECT paper_id FROM paper_questions WHERE question_id = 5')
+
+
+def test_no_usage_only_indexes(app):
+    names = {row[0] for row in db.session.execute(
+        db.text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'questions'"))}
+    assert 'ix_questions_subject_selection' in names
+    assert not names & {'ix_questions_subject_blooms_usage', 'ix_questions_subject_marks_usage'}
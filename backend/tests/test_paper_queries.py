@@ -0,0 +1,88 @@
+import pytest
+from tests.conftest import capture_statements, paper_body, seed_questions
+
+
+@pytest.mark.parametrize('prerender', [False, True])
+def test_generate_selects_do_not_grow_with_questions(app, client, auth_headers, prerender):
+    app.config['PDF_PRERENDER'] = prerender
+    client.post('/api/papers/generate', headers=auth_headers, json=paper_body(total_marks=100))  # warm pool and user caches
+
+    counts = {}
+    for total_marks in (20, 100):
+        with capture_statements(selects_only=True) as statements:
+            response = client.post('/api/papers/generate', headers=auth_headers,
+                                   json=paper_body(total_marks=total_marks))
+        assert response.status_code == 201
+        paper = response.get_json()['paper']
+        assert paper['question_count'] == len(paper['questions'])
+        assert all(q['subject_name'] == 'Computer Science' for q in paper['questions'])
+        counts[total_marks] = len(statements)
+    assert counts[20] == counts[100]
+
+
+@pytest.mark.parametrize('prerender', [False, True])
+def test_generate_set_selects_do_not_grow_with_variants(app, client, auth_headers, prerender):
+    app.config['PDF_PRERENDER'] = prerender
+    client.post('/api/papers/generate-set', headers=auth_headers,
+                json=paper_body(total_marks=100, variants=2, max_overlap=0.2))
+
+    counts = {}
+    for variants in (2, 4):
+        with capture_statements(selects_only=True) as statements:
+            response = client.post('/api/papers/generate-set', headers=auth_headers,
+                                   json=paper_body(total_marks=100, variants=variants, max_overlap=0.2))
+        assert response.status_code == 201
+        assert len(response.get_json()['papers']) == variants
+        counts[variants] = len(statements)
+    assert counts[2] == counts[4]
+
+
+def test_generate_reports_updated_usage(client, auth_headers):
+    response = client.post('/api/papers/generate', headers=auth_headers, json=paper_body(total_marks=20))
+    for question in response.get_json()['paper']['questions']:
+        assert question['times_used'] >= 1
+
+
+def _generate(client, auth_headers, count, total_marks=20):
+    for _ in range(count):
+        response = client.post('/api/papers/generate', headers=auth_headers, json=paper_body(total_marks=total_marks))
+        assert response.status_code == 201
+    return response.get_json()['paper']['id']
+
+
+def _statement_count(client, auth_headers, url):
+    with capture_statements() as statements:
+        response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+def test_paper_list_statements_do_not_grow_with_papers(client, auth_headers):
+    counts = {}
+    for added, total in ((2, 2), (8, 10)):
+        _generate(client, auth_headers, added)
+        counts[total], body = _statement_count(client, auth_headers, '/api/papers/')
+        assert body['count'] == total
+    assert counts[2] == counts[10]
+
+
+def test_question_list_statements_do_not_grow_with_questions(client, auth_headers):
+    client.get('/api/questions/', headers=auth_headers)  # warm user cache
+    counts = {}
+    for total in (600, 1000):
+        if total > 600:
+            seed_questions(count=total - 600, seed=2)
+        counts[total], body = _statement_count(client, auth_headers, '/api/questions/')
+        assert body['count'] == total
+        assert all(q['subject_name'] == 'Computer Science' for q in body['questions'])
+    assert counts[600] == counts[1000]
+
+
+def test_paper_detail_statements_do_not_grow_with_questions(client, auth_headers):
+    counts = {}
+    for total_marks in (20, 100):
+        paper_id = _generate(client, auth_headers, 1, total_marks=total_marks)
+        counts[total_marks], body = _statement_count(client, auth_headers, f'/api/papers/{paper_id}')
+        assert body['paper']['question_count'] == len(body['paper']['questions'])
+        assert all(q['subject_name'] == 'Computer Science' for q in body['paper']['questions'])
+    assert counts[20] == counts[100]
@@ -0,0 +1,84 @@
+import threading
+import pytest
+from app.services import pdf_renderer
+from app.services.pdf_cache import PdfCache, paper_key
+from app.services.pdf_renderer import PdfRenderer
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Fake render_pdf: records paper ids, blocks paper 1 until release is set"""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def render(paper_data):
+        calls.append(paper_data['id'])
+        if paper_data['id'] == 1:
+            started.set()
+            assert release.wait(5)
+        return b'%PDF-' + str(paper_data['id']).encode()
+
+    monkeypatch.setattr(pdf_renderer, 'render_pdf', render)
+    yield calls, started, release
+    release.set()
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    renderer = PdfRenderer(PdfCache(str(tmp_path)), workers=1)
+    yield renderer
+    renderer._executor.shutdown(wait=True)
+
+
+def _paper(paper_id):
+    return {'id': paper_id, 'title': f'Paper {paper_id}'}
+
+
+def test_download_renders_inline_instead_of_waiting_behind_queue(renderer, renders):
+    calls, started, release = renders
+    renderer.prerender(1, _paper(1))
+    assert started.wait(5)
+    renderer.prerender(2, _paper(2))  # queued behind paper 1
+
+    path = renderer.get_or_render(2, paper_key(_paper(2)), _paper(2))
+    assert not release.is_set()
+    assert open(path, 'rb').read() == b'%PDF-2'
+    assert renderer.waits == 0
+
+    release.set()
+    renderer._executor.shutdown(wait=True)
+    # The queued job found the download's file and did not render again
+    assert calls == [1, 2]
+
+
+def test_download_waits_for_render_in_flight(renderer, renders):
+    calls, started, release = renders
+    renderer.prerender(1, _paper(1))
+    assert started.wait(5)
+
+    result = []
+    download = threading.Thread(target=lambda: result.append(
+        renderer.get_or_render(1, paper_key(_paper(1)), _paper(1))))
+    download.start()
+    download.join(0.2)
+    assert download.is_alive()
+
+    release.set()
+    download.join(5)
+    assert open(result[0], 'rb').read() == b'%PDF-1'
+    assert renderer.waits == 1
+    assert calls == [1]
+
+
+def test_prerender_is_queued_once(renderer, renders):
+    calls, started, release = renders
+    renderer.prerender(1, _paper(1))
+    assert started.wait(5)
+    for _ in range(3):
+        renderer.prerender(2, _paper(2))
+    assert renderer.stats()['queued'] == 1
+
+    release.set()
+    renderer._executor.shutdown(wait=True)
+    assert calls == [1, 2]
@@ -0,0 +1,63 @@
+import pytest
+from reportlab import rl_config
+from app.services import pdf_templates
+from app.services.pdf_generator import generate_paper_pdf
+
+
+@pytest.fixture(autouse=True)
+def invariant_pdfs(monkeypatch):
+    """Fixed creation date and document id, so equal layouts give equal bytes"""
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+    pdf_templates.get_template().clear()
+    yield
+    pdf_templates.get_template().clear()
+
+
+def _question(qid, words):
+    text = ' '.join(f'word{qid}-{i}' for i in range(words))
+    if qid % 3 == 0:
+        return {'id': qid, 'text': text, 'question_type': 'mcq', 'marks': 1,
+                'options': {'a': 'alpha', 'b': 'beta', 'c': 'gamma', 'd': 'delta'}}
+    return {'id': qid, 'text': text, 'question_type': 'long', 'marks': 10, 'options': None}
+
+
+def _paper(questions):
+    return {'title': 'Layout', 'total_marks': 100, 'duration_minutes': 60,
+            'subject_name': 'Computer Science', 'date': '18 October 2026', 'questions': questions}
+
+
+# Long questions, so several of them split across page breaks
+QUESTIONS = [_question(qid, 60 + 45 * (qid % 4)) for qid in range(1, 31)]
+
+
+def test_warm_render_matches_cold_render():
+    template = pdf_templates.get_template()
+    paper = _paper(QUESTIONS)
+    hits = template.hits
+    cold = generate_paper_pdf(paper).getvalue()
+    assert template.hits == hits
+
+    warm = generate_paper_pdf(paper).getvalue()
+    assert template.hits == hits + len(QUESTIONS)
+    assert warm == cold
+
+
+def test_reuse_at_other_positions_does_not_leak_layout():
+    paper = _paper(QUESTIONS)
+    cold = generate_paper_pdf(paper).getvalue()
+
+    # Same questions in a different order split at different places
+    generate_paper_pdf(_paper(QUESTIONS[::-1])).getvalue()
+    generate_paper_pdf(_paper(QUESTIONS[5:] + QUESTIONS[:5])).getvalue()
+
+    assert generate_paper_pdf(paper).getvalue() == cold
+
+
+def test_shifted_paper_matches_its_own_cold_render():
+    shifted = _paper(QUESTIONS[7:] + QUESTIONS[:7])
+    pdf_templates.get_template().clear()
+    cold = generate_paper_pdf(shifted).getvalue()
+
+    pdf_templates.get_template().clear()
+    generate_paper_pdf(_paper(QUESTIONS))
+    assert generate_paper_pdf(shifted).getvalue() == cold
@@ -0,0 +1,201 @@
+import pytest
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models.question import Question
+from app.models.user import User
+from app.services import question_pool
+from app.services.paper_generator import generate_paper
+from app.services.question_pool import PoolEntry, PoolRegistry, SubjectPool
+from tests.conftest import paper_body, seed_questions
+
+
+def _entry(qid, marks=2, times_used=0, blooms_level='remember', difficulty='easy', question_type='short'):
+    return PoolEntry(qid, blooms_level, difficulty, question_type, marks, times_used)
+
+
+def test_candidates_least_used_first():
+    pool = SubjectPool(1, [_entry(1, times_used=2), _entry(2, times_used=0), _entry(3, times_used=1)])
+    assert [e.id for e in pool.candidates()] == [2, 3, 1]
+    assert [e.id for e in pool.candidates(exclude={2})] == [3, 1]
+
+
+def test_readers_keep_their_snapshot_while_writers_swap_buckets():
+    pool = SubjectPool(1, [_entry(i) for i in range(1, 6)])
+    reader = pool.candidates()
+    assert next(reader).id == 1
+
+    pool.upsert(_entry(10, marks=5, difficulty='hard'))
+    pool.discard(2)
+    pool.record_usage([3])
+
+    # The in-flight iteration finishes over the buckets it started with
+    assert [e.id for e in reader] == [2, 3, 4, 5]
+    assert [e.id for e in pool.candidates()] == [1, 4, 5, 10, 3]
+    assert pool.bucket_counts() == {('remember', 'easy', 2): 4, ('remember', 'hard', 5): 1}
+
+
+def test_bucket_counts_respects_exclude_and_type():
+    pool = SubjectPool(1, [_entry(1), _entry(2), _entry(3, marks=1, question_type='mcq')])
+    assert pool.bucket_counts(question_type='short', exclude={1, 3}) == {('remember', 'easy', 2): 1}
+
+
+class _RacingRegistry(PoolRegistry):
+    """Simulates a write committing and firing its hook while the pool loads"""
+
+    def __init__(self, loads):
+        super().__init__()
+        self._loads = list(loads)
+        self.load_calls = 0
+
+    def _load(self, subject_id):
+        self.load_calls += 1
+        entries = self._loads.pop(0)
+        if self._loads:
+            self.bump_version(subject_id)
+            assert self.peek(subject_id) is None
+        return 0, entries
+
+
+def test_registry_reloads_when_bank_changes_mid_load():
+    stale = [_entry(1)]
+    fresh = [_entry(1), _entry(2)]
+    registry = _RacingRegistry([stale, fresh])
+
+    pool = registry.get(1)
+    assert registry.load_calls == 2
+    assert 2 in pool
+    assert registry.get(1) is pool
+
+
+def test_registry_invalidate_all_forces_reload_of_unversioned_subject():
+    registry = PoolRegistry()
+    calls = []
+
+    def load(subject_id):
+        calls.append(subject_id)
+        if len(calls) == 1:
+            registry.invalidate()
+        return 0, [_entry(len(calls))]
+
+    registry._load = load
+    pool = registry.get(7)
+    assert len(calls) == 2
+    assert 2 in pool
+
+
+def test_hooks_keep_warm_pool_in_sync(app):
+    pool = question_pool.get_pool(1)
+    assert len(pool) == 600
+    first = next(pool.candidates())
+
+    before = question_pool.bank_version(1)
+    question_pool.questions_used(1, [first.id])
+    assert question_pool.bank_version(1) == before + 1
+    assert next(e for e in pool.candidates() if e.id == first.id).times_used == first.times_used + 1
+
+    question_pool.question_deleted(1, first.id)
+    assert first.id not in pool
+
+
+def test_hooks_apply_own_writes_and_skip_loaded_ones():
+    pool = SubjectPool(1, [_entry(1), _entry(2)], db_version=5)
+
+    pool.record_usage([1], db_version=5)  # already in the loaded rows
+    assert next(e for e in pool.candidates() if e.id == 1).times_used == 0
+
+    pool.record_usage([1], db_version=6)
+    assert pool.db_version == 6
+    assert next(e for e in pool.candidates() if e.id == 1).times_used == 1
+
+    # Version 7 came from another process: apply ours, but stay behind
+    pool.discard(2, db_version=8)
+    assert 2 not in pool
+    assert pool.db_version == 6
+
+
+def test_registry_reloads_pool_behind_db_counter():
+    registry = PoolRegistry()
+    loads = [(3, [_entry(1)]), (4, [_entry(1), _entry(2)])]
+    registry._load = lambda subject_id: loads.pop(0)
+
+    pool = registry.get(1, db_version=3)
+    assert registry.get(1, db_version=3) is pool
+    assert registry.get(1) is pool
+
+    fresh = registry.get(1, db_version=4)
+    assert fresh is not pool and 2 in fresh and fresh.db_version == 4
+
+
+@pytest.fixture
+def two_workers(tmp_path, monkeypatch):
+    """Two app instances sharing one SQLite file, like two worker processes"""
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'shared.db'}")
+    monkeypatch.setattr(TestingConfig, 'SQLITE_PRAGMAS', {'journal_mode': 'WAL', 'busy_timeout': 5000})
+    workers = []
+    for _ in range(2):
+        worker = create_app('testing')
+        worker.config.update(JWT_ACCESS_TOKEN_EXPIRES=False, PDF_PRERENDER=False)
+        workers.append(worker)
+
+    with workers[0].app_context():
+        user = User(username='tester', email='tester@example.com')
+        user.set_password('pw')
+        db.session.add(user)
+        seed_questions(count=200)
+
+    clients = []
+    for worker in workers:
+        client = worker.test_client()
+        token = client.post('/api/auth/login', json={'email': 'tester@example.com', 'password': 'pw'})\
+            .get_json()['access_token']
+        clients.append((client, {'Authorization': f'Bearer {token}'}))
+    yield clients
+    for worker in workers:
+        with worker.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+def _generate_tens(client, headers, count=3):
+    response = client.post('/api/papers/generate', headers=headers,
+                           json=paper_body(total_marks=10 * count, config={'custom_distribution': {'10': count}}))
+    assert response.status_code == 201
+    paper = response.get_json()['paper']
+    assert paper['total_marks'] == 10 * count
+    return {q['id'] for q in paper['questions']}
+
+
+def test_worker_sees_deletes_from_another_worker(two_workers):
+    (client_a, headers_a), (client_b, headers_b) = two_workers
+    _generate_tens(client_a, headers_a)  # warm A's pool
+
+    tens = [q['id'] for q in client_b.get('/api/questions/?subject_id=1', headers=headers_b)
+            .get_json()['questions'] if q['marks'] == 10]
+    for qid in tens[:len(tens) - 10]:
+        assert client_b.delete(f'/api/questions/{qid}', headers=headers_b).status_code == 200
+
+    remaining = set(tens[len(tens) - 10:])
+    assert _generate_tens(client_a, headers_a) <= remaining
+
+
+def test_worker_rotates_past_questions_used_by_another_worker(two_workers):
+    (client_a, headers_a), (client_b, headers_b) = two_workers
+    first = _generate_tens(client_a, headers_a)
+    second = _generate_tens(client_b, headers_b)
+    third = _generate_tens(client_a, headers_a)
+    assert not third & (first | second)
+
+
+def test_stale_pool_selects_again_instead_of_short_paper(app):
+    pool = question_pool.get_pool(1)
+    ids = [e.id for e in pool.candidates(marks=10)]
+
+    # Delete behind the pool's back, without bumping any counter
+    db.session.execute(db.delete(Question).where(Question.id.in_(ids[:len(ids) - 5])))
+    db.session.commit()
+
+    result = generate_paper(1, 30, {'custom_distribution': {'10': 3}})
+    assert result['success']
+    assert result['total_marks_allocated'] == 30
+    assert {q.id for q in result['questions']} <= set(ids[len(ids) - 5:])
@@ -0,0 +1,30 @@
+import gzip
+import pytest
+
+
+def test_render_html(client, auth_headers, paper_id):
+    response = client.get(f'/api/papers/{paper_id}/render', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/html'
+    assert b'Test Paper' in response.data
+    assert 'private' in response.headers['Cache-Control']
+
+
+def test_render_rejects_other_formats(client, auth_headers, paper_id):
+    response = client.get(f'/api/papers/{paper_id}/render?format=pdf', headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_render_etag_is_weak_and_revalidates(client, auth_headers, paper_id, encoding):
+    headers = dict(auth_headers, **{'Accept-Encoding': encoding})
+    response = client.get(f'/api/papers/{paper_id}/render', headers=headers)
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    if encoding == 'gzip':
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert b'Test Paper' in gzip.decompress(response.data)
+
+    again = client.get(f'/api/papers/{paper_id}/render', headers=dict(headers, **{'If-None-Match': etag}))
+    assert again.status_code == 304
+    assert again.data == b''
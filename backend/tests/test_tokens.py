@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.services import tokens
+
+
+def _login(client):
+    response = client.post('/api/auth/login', json={'email': 'tester@example.com', 'password': 'pw'})
+    assert response.status_code == 200
+    return response.get_json()['refresh_token']
+
+
+def _refresh(client, refresh_token):
+    return client.post('/api/auth/refresh', headers={'Authorization': f'Bearer {refresh_token}'})
+
+
+def test_refresh_rotates_token(client):
+    old = _login(client)
+    response = _refresh(client, old)
+    assert response.status_code == 200
+    new = response.get_json()['refresh_token']
+    assert new != old
+
+    assert _refresh(client, new).status_code == 200
+    assert RefreshToken.query.filter(RefreshToken.revoked_at.is_(None)).count() == 1
+
+
+def test_replay_within_grace_keeps_session(client):
+    old = _login(client)
+    new = _refresh(client, old).get_json()['refresh_token']
+
+    # Two tabs racing: the loser is refused, the winner's token still works
+    assert _refresh(client, old).status_code == 401
+    assert _refresh(client, new).status_code == 200
+
+
+def test_replay_after_grace_ends_session(app, client):
+    old = _login(client)
+    new = _refresh(client, old).get_json()['refresh_token']
+    db.session.query(RefreshToken).filter(RefreshToken.replaced_by.isnot(None)).update(
+        {'revoked_at': datetime.utcnow() - timedelta(seconds=app.config['JWT_REFRESH_REUSE_GRACE'] + 1)})
+    db.session.commit()
+
+    assert _refresh(client, old).status_code == 401
+    assert _refresh(client, new).status_code == 401
+
+
+def test_rotate_issues_one_pair_per_token(client):
+    _login(client)
+    jti = RefreshToken.query.one().jti
+
+    # The second call is what a request that passed the revocation check
+    # alongside the first would see once the first has committed
+    assert tokens.rotate(jti, 1) is not None
+    db.session.commit()
+    assert tokens.rotate(jti, 1) is None
+    db.session.rollback()
+    assert RefreshToken.query.count() == 2
+
+
+def test_logout_revokes_only_presented_token(client):
+    first, second = _login(client), _login(client)
+    response = client.post('/api/auth/logout', headers={'Authorization': f'Bearer {first}'})
+    assert response.status_code == 200
+    assert _refresh(client, first).status_code == 401
+    assert _refresh(client, second).status_code == 200
+
+
+def test_logout_all_revokes_every_session(client):
+    first, second = _login(client), _login(client)
+    response = client.post('/api/auth/logout', headers={'Authorization': f'Bearer {first}'}, json={'all': True})
+    assert response.status_code == 200
+    assert _refresh(client, first).status_code == 401
+    assert _refresh(client, second).status_code == 401
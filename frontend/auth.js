@@ -0,0 +1,59 @@
+// ─── Session Renewal (refresh tokens) ───
+// Wraps fetch so an expired access token is renewed with the stored
+// refresh token (POST /auth/refresh) and the request retried once.
+// Concurrent 401s share a single refresh call.
+(function () {
+    const nativeFetch = window.fetch.bind(window);
+    let refreshing = null;
+
+    function apiRoot(url) {
+        const i = url.indexOf('/api/');
+        return i === -1 ? null : url.slice(0, i + 4);
+    }
+
+    function refresh(root) {
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (!refreshToken) return Promise.resolve(null);
+        if (!refreshing) {
+            refreshing = nativeFetch(`${root}/auth/refresh`, { method: 'POST', headers: { 'Authorization': `Bearer ${refreshToken}` } })
+                .then(res => res.ok ? res.json() : null)
+                .then(data => {
+                    if (!data) return null;
+                    localStorage.setItem('token', data.access_token);
+                    localStorage.setItem('refresh_token', data.refresh_token);
+                    return data.access_token;
+                })
+                .catch(() => null)
+                .finally(() => { refreshing = null; });
+        }
+        return refreshing;
+    }
+
+    window.fetch = async function (input, init = {}) {
+        const url = typeof input === 'string' ? input : input.url;
+        const headers = new Headers(init.headers || {});
+        const root = apiRoot(url);
+        if (!root || !headers.has('Authorization') || url.startsWith(`${root}/auth/`)) return nativeFetch(input, init);
+
+        // Pages capture the token once at load; always send the latest one
+        const sent = localStorage.getItem('token');
+        if (sent) headers.set('Authorization', `Bearer ${sent}`);
+        const res = await nativeFetch(input, { ...init, headers });
+        if (res.status !== 401) return res;
+
+        // Another tab may already have rotated the tokens
+        const token = localStorage.getItem('token') !== sent ? localStorage.getItem('token') : await refresh(root);
+        if (!token) return res;
+        headers.set('Authorization', `Bearer ${token}`);
+        return nativeFetch(input, { ...init, headers });
+    };
+
+    // Revoke the refresh token server-side, then clear the local session
+    window.endSession = function (api) {
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (refreshToken) {
+            nativeFetch(`${api}/auth/logout`, { method: 'POST', keepalive: true, headers: { 'Authorization': `Bearer ${refreshToken}` } }).catch(() => {});
+        }
+        localStorage.clear();
+    };
+})();